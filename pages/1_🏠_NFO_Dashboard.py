@@ -10,6 +10,7 @@ import os
 
 # Import our utilities
 from utils.fpl_api import FPLApiClient
+from utils.live_poller import get_live_poller
 from utils.constants import LEAGUE_IDS, TEAM_COLORS
 
 # Page config
@@ -32,25 +33,41 @@ def get_api_client():
     return FPLApiClient()
 
 api = get_api_client()
+poller = get_live_poller(api)
+
+def get_nfo_entry_ids(nfo_league):
+    """Entry IDs of everyone in the NFO Mini League (standings and new entries)"""
+    if not nfo_league:
+        return []
+    rows = nfo_league['standings']['results'] + nfo_league.get('new_entries', {}).get('results', [])
+    return list(dict.fromkeys(row['entry'] for row in rows))
 
 def load_nfo_data():
     """Load all NFO-related data"""
     try:
+        # NFO standings come from the shared live poller once it has published a snapshot
+        live_standings = poller.snapshot.standings if poller.snapshot else {}
+        
+        # Fetch bootstrap, NFO Mini League and Main QFPL League in one concurrent round trip
+        bootstrap, nfo_league, main_league = api.fetch_many([
+            (api.get_bootstrap,),
+            (lambda: live_standings.get(LEAGUE_IDS['NFO_MINI']) or api.get_nfo_mini_league(),),
+            (api.get_qfpl_main_league,),
+        ])
+
         # Get current gameweek
-        bootstrap_data = api.get_bootstrap_data()
-        current_gw = api.get_current_gameweek() if bootstrap_data else 1
-        
-        # Get NFO Mini League
-        nfo_league = api.get_nfo_mini_league()
-        
-        # Get Main QFPL League  
-        main_league = api.get_qfpl_main_league()
-        
+        current_gw = api.get_current_gameweek() if bootstrap else 1
+
+        # Find NFO players anywhere in the Main QFPL League, stopping once all are found
+        nfo_entry_ids = get_nfo_entry_ids(nfo_league)
+        main_league_nfo = api.get_league_standings_df(LEAGUE_IDS['QFPL_MAIN'], nfo_entry_ids) if nfo_entry_ids else None
+
         return {
             'current_gw': current_gw,
             'nfo_league': nfo_league,
             'main_league': main_league,
-            'bootstrap': bootstrap_data
+            'main_league_nfo': main_league_nfo,
+            'bootstrap': bootstrap
         }
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
@@ -255,11 +272,10 @@ def display_main_league_position(data):
     main_standings = data['main_league']['standings']['results']
     main_new_entries = data['main_league'].get('new_entries', {}).get('results', [])
     
-    # Get NFO player entry IDs from mini league
-    nfo_entry_ids = []
-    if data['nfo_league']:
-        nfo_entries = data['nfo_league'].get('new_entries', {}).get('results', [])
-        nfo_entry_ids = [player['entry'] for player in nfo_entries]
+    # NFO rows matched by entry ID across every page of the main league
+    main_league_nfo = data.get('main_league_nfo')
+    if main_league_nfo is None:
+        main_league_nfo = pd.DataFrame(columns=['entry', 'section'])
     
     nfo_teams = []
     
@@ -268,9 +284,7 @@ def display_main_league_position(data):
         st.info("🎯 QFPL season hasn't started yet, but NFO players are joining the main league!")
         
         # Find NFO players in main league using entry ID matching
-        for entry in main_new_entries:
-            if entry['entry'] in nfo_entry_ids:
-                nfo_teams.append(entry)
+        nfo_teams = main_league_nfo[main_league_nfo['section'] == 'new_entries'].to_dict('records')
         
         if nfo_teams:
             st.success(f"Found {len(nfo_teams)} NFO players in main QFPL league!")
@@ -293,9 +307,7 @@ def display_main_league_position(data):
             
     elif main_standings:
         # Season has started - check standings and match by entry ID
-        for team in main_standings:
-            if team['entry'] in nfo_entry_ids:
-                nfo_teams.append(team)
+        nfo_teams = main_league_nfo[main_league_nfo['section'] == 'standings'].to_dict('records')
         
         if nfo_teams:
             st.success(f"Found {len(nfo_teams)} NFO representatives in main league!")
@@ -430,7 +442,10 @@ def main():
         
         # Compact refresh button
         if st.button("🔄 Refresh", help="Get latest data", use_container_width=True):
-            st.cache_data.clear()
+            # Only the two leagues this page shows; bootstrap and picks stay cached
+            api.invalidate('standings', league_id=LEAGUE_IDS['NFO_MINI'])
+            api.invalidate('standings', league_id=LEAGUE_IDS['QFPL_MAIN'])
+            poller.poll_now()
             st.rerun()
         
         st.markdown("---")
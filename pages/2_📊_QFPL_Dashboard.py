@@ -3,12 +3,13 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import numpy as np
 import os
 
 # Import our utilities
 from utils.fpl_api import FPLApiClient
-from utils.constants import LEAGUE_IDS, TEAM_COLORS
+from utils.constants import LEAGUE_IDS, TEAMS, TEAM_COLORS, CLUB_LEAGUES, CLUB_SQUAD_SIZE, HOME_CLUB, SEASON_NAME
+from utils.history_store import get_history_store
+from utils.championship import club_members, club_gameweek_scores, championship_table, squad_status
 
 # Page config
 st.set_page_config(
@@ -29,6 +30,57 @@ def get_api_client():
     return FPLApiClient()
 
 api = get_api_client()
+history = get_history_store()
+
+def league_average_points(league_id):
+    """Average gameweek points of a league's current members, from the local history store"""
+    members = api.get_league_standings_df(league_id)
+    if members.empty:
+        return pd.Series(dtype=float)
+    points = history.entry_points(members['entry'].dropna())
+    return points.groupby('gameweek')['points'].mean()
+
+def display_performance_trends():
+    """Gameweek points trends answered from the season history store"""
+    st.subheader("📈 Performance Trends")
+    
+    trends = pd.DataFrame({
+        'QFPL': league_average_points(LEAGUE_IDS['QFPL_MAIN']),
+        'NFO': league_average_points(LEAGUE_IDS['NFO_MINI']),
+        'Average': history.gameweek_averages().set_index('gameweek')['average_entry_score'],
+    }).dropna(how='all')
+    if trends.empty:
+        st.info("📭 **No history yet**\n\nTrends build up as each gameweek finishes and is saved locally.")
+        return
+    
+    trends.index = [f"GW{gw}" for gw in trends.index]
+    fig = px.line(trends.round(1), x=trends.index, y=list(trends.columns),
+                 title="Average Gameweek Points",
+                 color_discrete_map={'QFPL': '#1f77b4', 'NFO': '#DD0000', 'Average': '#888888'},
+                 labels={'x': 'Gameweek', 'value': 'Points', 'variable': ''})
+    fig.update_layout(height=400)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.caption(f"📊 {len(trends)} gameweeks stored locally")
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def championship(gameweeks, members_key, _members):
+    """Club gameweek scores and championship table, computed once per stored gameweeks and membership"""
+    points = history.entry_points(_members['entry'].tolist())
+    if not points.empty:
+        points = points.assign(points=points['points'] - points['event_transfers_cost'].fillna(0))
+    scores = club_gameweek_scores(_members, points)
+    return scores, championship_table(scores)
+
+def display_club_trends(scores):
+    """Per-gameweek club scores in the championship"""
+    if scores.empty:
+        st.info("📋 Club gameweek scores will appear once gameweeks are stored.")
+        return
+    fig = px.line(scores, x='gameweek', y='points', color='club', markers=True,
+                  color_discrete_map=TEAM_COLORS, labels={'gameweek': 'Gameweek', 'points': 'Club Points', 'club': ''})
+    fig.update_layout(height=350)
+    st.plotly_chart(fig, use_container_width=True)
 
 def main():
     # Sidebar Navigation
@@ -45,7 +97,9 @@ def main():
         
         # Refresh button
         if st.button("🔄 Refresh Data", help="Get latest QFPL data", use_container_width=True):
-            st.cache_data.clear()
+            # The main league plus every club mini league (the home club's included) behind the championship
+            for league_id in dict.fromkeys((LEAGUE_IDS['QFPL_MAIN'], *CLUB_LEAGUES.values())):
+                api.invalidate('standings', league_id=league_id)
             st.rerun()
         
         st.markdown("---")
@@ -58,19 +112,24 @@ def main():
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        st.metric("🏆 Season", "Season 10")
+        st.metric("🏆 Season", SEASON_NAME)
     with col2:
-        st.metric("👥 Total Teams", "20")
+        st.metric("👥 Total Teams", f"{len(TEAMS)}")
     with col3:
-        st.metric("⚡ Current GW", "GW 1")
+        st.metric("⚡ Current GW", f"GW {api.get_current_gameweek()}")
     with col4:
         st.metric("📊 Status", "Pre-season")
     with col5:
-        st.metric("🎮 League ID", "65689")
+        st.metric("🎮 League ID", f"{LEAGUE_IDS['QFPL_MAIN']}")
     
     st.markdown("---")
     
     # Main content areas
+    members = club_members(api)
+    scores, table = championship(tuple(history.ingested_gameweeks()), tuple(zip(members['club'], members['entry'])), members)
+    status = squad_status(members)
+    joined = dict(zip(status['club'], status['joined']))
+    
     tab1, tab2, tab3 = st.tabs(["📊 League Overview", "⚔️ Team Analysis", "📈 Performance Trends"])
     
     with tab1:
@@ -79,28 +138,26 @@ def main():
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            st.info("🚧 **Coming Soon!** \n\nFull league standings and team analysis will be available once the season starts. Currently showing pre-season data.")
-            
-            # Placeholder for league table
-            st.write("**📋 League Standings (Preview)**")
-            placeholder_data = {
-                "Rank": ["1st", "2nd", "3rd", "...", "20th"],
-                "Team": ["NFO", "LIV", "MCI", "...", "Team 20"],
-                "Players": ["11", "11", "11", "...", "11"],
-                "Total Points": ["-", "-", "-", "...", "-"],
-                "Status": ["Ready", "Ready", "Ready", "...", "Joining"]
-            }
-            df = pd.DataFrame(placeholder_data)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.write("**📋 Championship Standings**")
+            st.dataframe(pd.DataFrame({
+                "Rank": table['rank'],
+                "Team": table['club'],
+                "Players": table['club'].map(joined).fillna(0).astype(int),
+                "Total Points": table['total'].astype(int),
+                "GW Wins": table['gameweek_wins'],
+                "Last GW": table['last_gameweek'].astype(int),
+            }), use_container_width=True, hide_index=True)
+            if scores.empty:
+                st.caption("Points are added as gameweeks are stored.")
         
         with col2:
             st.write("**🎯 League Statistics**")
-            st.metric("Teams Ready", "15/20")
-            st.metric("Total Players", "180+")
+            st.metric("Teams Ready", f"{int(status['ready'].sum())}/{len(TEAMS)}")
+            st.metric("Total Players", f"{len(members)}")
             st.metric("Season Format", "H2H + Classic")
             
             st.write("**📈 Progress**")
-            progress = 75  # 15/20 teams ready
+            progress = round(100 * status['ready'].sum() / len(TEAMS))
             st.progress(progress/100)
             st.caption(f"{progress}% teams ready for season start")
     
@@ -111,35 +168,19 @@ def main():
         
         with col1:
             st.write("**🌲 NFO Team Status**")
-            st.success("✅ Squad: 6/11 players joined")
-            st.info("📊 League Position: TBD")
-            st.warning("⚠️ Status: Needs 5 more players")
+            nfo_joined = joined.get(HOME_CLUB, 0)
+            nfo_rank = table.loc[table['club'] == HOME_CLUB, 'rank']
+            st.success(f"✅ Squad: {nfo_joined}/{CLUB_SQUAD_SIZE} players joined")
+            st.info(f"📊 League Position: {int(nfo_rank.iloc[0]) if len(nfo_rank) and not scores.empty else 'TBD'}")
+            if nfo_joined < CLUB_SQUAD_SIZE:
+                st.warning(f"⚠️ Status: Needs {CLUB_SQUAD_SIZE - nfo_joined} more players")
         
         with col2:
             st.write("**🏆 Other Mini-Leagues**")
-            st.info("📋 **Coming Soon!**\n\nAnalysis of all 20 team mini-leagues will be available here.")
+            display_club_trends(scores)
     
     with tab3:
-        st.subheader("📈 Performance Trends")
-        st.info("🚧 **Season Not Started**\n\nPerformance analytics and trends will be available once gameweeks begin.")
-        
-        # Placeholder chart
-        st.write("**📊 Preview: Team Performance Chart**")
-        
-        # Sample data for visualization preview
-        sample_data = pd.DataFrame({
-            'Gameweek': [f"GW{i}" for i in range(1, 11)],
-            'NFO': np.random.randint(50, 80, 10),
-            'Average': np.random.randint(45, 75, 10)
-        })
-        
-        fig = px.line(sample_data, x='Gameweek', y=['NFO', 'Average'], 
-                     title="Team Performance Over Time (Preview)",
-                     color_discrete_map={'NFO': '#DD0000', 'Average': '#888888'})
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.caption("📊 This is a preview chart. Real data will appear when the season starts.")
+        display_performance_trends()
     
     # Footer
     st.markdown("---")
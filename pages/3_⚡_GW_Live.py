@@ -8,7 +8,11 @@ import os
 
 # Import our utilities
 from utils.fpl_api import FPLApiClient
-from utils.constants import LEAGUE_IDS, TEAM_COLORS
+from utils.constants import LEAGUE_IDS, TEAM_COLORS, LIVE_POLL_SECONDS, H2H_LEAGUE_IDS, HOME_CLUB
+from utils.live_poller import get_live_poller
+from utils.live_schedule import fixture_status, next_poll_delay
+from utils.live_scoring import live_table
+from utils.h2h import resolve_matches, project_table
 
 # Page config
 st.set_page_config(
@@ -29,62 +33,154 @@ def get_api_client():
     return FPLApiClient()
 
 api = get_api_client()
+poller = get_live_poller(api)
 
-def main():
-    # Sidebar Navigation
-    with st.sidebar:
-        st.markdown("### ⚡ GW Live")
-        st.success("Real-time Tracking")
-        
-        st.markdown("### 📊 Navigation")
-        st.page_link("main.py", label="🏠 Home", icon="🏠")
-        st.page_link("pages/1_🏠_NFO_Dashboard.py", label="🌲 NFO Dashboard", icon="🌲")
-        st.page_link("pages/2_📊_QFPL_Dashboard.py", label="🏆 QFPL Dashboard", icon="🏆")
-        st.page_link("pages/3_⚡_GW_Live.py", label="⚡ GW Live", icon="⚡")
-        st.page_link("pages/4_🧠_Intelligence.py", label="🧠 Intelligence", icon="🧠")
-        
-        # Auto-refresh option
-        auto_refresh = st.checkbox("🔄 Auto-refresh (30s)", value=False)
-        
-        if st.button("🔄 Refresh Now", use_container_width=True):
-            st.cache_data.clear()
-            st.rerun()
-        
-        st.markdown("---")
-        st.caption("⚡ Live Updates")
-    
-    # Auto-refresh functionality
-    if auto_refresh:
-        st.rerun()
-    
-    # Main header
-    st.markdown('<div class="nfo-main-header"><h1>⚡ Gameweek Live Tracking</h1></div>', unsafe_allow_html=True)
+def display_live_status(current_gw, status):
+    """Live status indicators driven by the gameweek's fixtures"""
+    if status['total'] == 0:
+        state = "Pre-season"
+    elif status['live']:
+        state = "Live"
+    elif status['finished'] == status['total']:
+        state = "Finished"
+    else:
+        state = "Upcoming"
     
-    # Live status indicators
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        st.metric("⚡ Current GW", "GW 1")
+        st.metric("⚡ Current GW", f"GW {current_gw}")
     with col2:
-        st.metric("🕐 Status", "Pre-season")
+        st.metric("🕐 Status", state)
     with col3:
-        st.metric("⚽ Matches", "0/10")
+        st.metric("⚽ Matches", f"{status['finished'] + status['live']}/{status['total']}")
     with col4:
-        st.metric("🔴 Live Now", "0")
+        st.metric("🔴 Live Now", str(status['live']))
     with col5:
-        st.metric("🏁 Completed", "0")
+        st.metric("🏁 Completed", str(status['finished']))
+
+def player_names():
+    """Element id -> web name lookup from the bootstrap model"""
+    bootstrap = api.get_bootstrap()
+    if not bootstrap:
+        return {}
+    return dict(zip(bootstrap.players['id'], bootstrap.players['web_name']))
+
+def display_top_scorers(snapshot):
+    """Highest scoring players of the gameweek so far"""
+    points = snapshot.points
+    top = np.argsort(points)[::-1][:15]
+    top = top[points[top] > 0]
+    if len(top) == 0:
+        st.info("No points scored yet this gameweek.")
+        return
     
-    st.markdown("---")
+    names = player_names()
+    df = pd.DataFrame({
+        'Player': [names.get(element, f"#{element}") for element in top],
+        'Live Points': points[top],
+    })
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+def display_league_live(snapshot, league_id, table):
+    """Live leaderboard for one league from the precomputed live table"""
+    members = snapshot.members.get(league_id)
+    if members is None or members.empty:
+        st.info("League members not loaded yet.")
+        return
     
-    # Check if gameweek is live
-    is_live = False  # Will be dynamic based on API data
+    # Live ranks and movements come from the poller's incremental ranker
+    league_table = members.merge(table, on='entry').merge(snapshot.live_ranks[league_id], on='entry').sort_values('rank')
+    if league_table.empty:
+        st.info("Picks not available yet for this league.")
+        return
+    
+    names = player_names()
+    df = pd.DataFrame({
+        'Rank': league_table['rank'],
+        'Move': league_table['movement'].map(lambda move: f"▲{move}" if move > 0 else f"▼{-move}" if move < 0 else "-"),
+        'Player': league_table['player_name'],
+        'Team': league_table['entry_name'],
+        'Live Points': league_table['live_points'],
+        'Total': league_table['total'],
+        'Captain': league_table['captain'].map(lambda element: names.get(element, f"#{element}")),
+        'Auto-subs': league_table['auto_subs'],
+        'Chip': league_table['chip'].replace('', '-'),
+    })
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.caption(f"{len(df)} managers - projected with automatic substitutions and vice-captain cover")
+
+def display_h2h_live(snapshot, table):
+    """Live H2H matches and projected table, scored from the same live table as the classic leagues"""
+    if not H2H_LEAGUE_IDS:
+        st.info("No H2H leagues configured yet - add them under h2h_leagues in config/leagues.toml.")
+        return
+    
+    league_name = st.radio("League", list(H2H_LEAGUE_IDS), horizontal=True, key="h2h_live_league")
+    league_id = H2H_LEAGUE_IDS[league_name]
+    matches = api.get_h2h_matches_df(league_id, snapshot.gameweek)
+    standings = api.get_h2h_standings_df(league_id)
+    if matches.empty or standings.empty:
+        st.info("H2H fixtures not available yet for this gameweek.")
+        return
+    
+    resolved = resolve_matches(matches, table['entry'], table['live_points'])
+    names = dict(zip(standings['entry'], standings['player_name']))
+    st.dataframe(pd.DataFrame({
+        'Home': resolved['entry_1'].map(names),
+        'Score': resolved['score_1'].astype(int).astype(str) + " - " + resolved['score_2'].astype(int).astype(str),
+        'Away': resolved['entry_2'].map(names).fillna("Average"),
+    }), use_container_width=True, hide_index=True)
+    
+    projected = project_table(standings, resolved)
+    st.dataframe(pd.DataFrame({
+        'Rank': projected['projected_rank'],
+        'Move': projected['movement'].map(lambda move: f"▲{move}" if move > 0 else f"▼{-move}" if move < 0 else "-"),
+        'Player': projected['player_name'],
+        'W': projected['matches_won'],
+        'D': projected['matches_drawn'],
+        'L': projected['matches_lost'],
+        'Points For': projected['points_for'].astype(int),
+        'Points': projected['total'],
+    }), use_container_width=True, hide_index=True)
+    st.caption("Projected as if the live scores were final; managers outside the tracked leagues use FPL's match scores.")
+
+def live_board(auto_refresh, scheduled_live, awaiting_snapshot=False):
+    """Live fragment - reruns on its own schedule without redrawing the rest of the page"""
+    # Set by main() for the page run; any later run of this fragment is a scheduled tick
+    page_run = st.session_state.pop("live_board_page_run", False)
+    
+    # Read the shared poller's latest snapshot; sessions never call upstream here
+    snapshot = poller.snapshot
+    if snapshot is None:
+        st.info("⏳ Waiting for the first live update...")
+        return
+    
+    if awaiting_snapshot:
+        # The first snapshot arrived; rerun the page so polling is scheduled from it, not every 2s
+        st.rerun()
+    
+    status = fixture_status(snapshot.fixtures)
+    is_live = status['live'] > 0
+    
+    if auto_refresh and is_live != scheduled_live:
+        # A match kicked off or the last one finished; rerun the page to reschedule polling
+        st.rerun()
+    if auto_refresh and not is_live and not page_run:
+        # Woke for a kickoff that isn't flagged as started yet; recompute the delay instead of
+        # sleeping until the next kickoff again
+        st.rerun()
+    
+    display_live_status(snapshot.gameweek, status)
+    
+    st.markdown("---")
     
     if not is_live:
         # Pre-season or between gameweeks
         st.info("🚧 **Gameweek Not Active** \n\nLive tracking will be available during active gameweeks. Currently in pre-season mode.")
         
         # Preview of live features
-        tab1, tab2, tab3 = st.tabs(["🎯 Live Features Preview", "📊 NFO Live Board", "⚽ Match Center"])
+        tab1, tab2, tab3 = st.tabs(["🎯 Live Features Preview", f"📊 {HOME_CLUB} Live Board", "⚽ Match Center"])
         
         with tab1:
             st.subheader("⚡ What's Coming Live")
@@ -93,10 +189,10 @@ def main():
             
             with col1:
                 st.write("**🔴 Real-time Features:**")
-                st.markdown("""
+                st.markdown(f"""
                 - Live scoring as goals happen
                 - Real-time league position updates
-                - NFO vs NFO live comparisons
+                - {HOME_CLUB} vs {HOME_CLUB} live comparisons
                 - Captain performance tracking
                 - Bonus points updates
                 - Player substitution alerts
@@ -114,19 +210,23 @@ def main():
                 """)
         
         with tab2:
-            st.subheader("📊 NFO Live Leaderboard (Preview)")
+            st.subheader(f"📊 {HOME_CLUB} Live Leaderboard (Preview)")
             
-            # Sample NFO live data
+            # Home club managers from the poller's league members
+            members = snapshot.members.get(LEAGUE_IDS['NFO_MINI'], pd.DataFrame(columns=['player_name', 'entry_name']))
             preview_data = {
-                "Player": ["Jay Bansal", "Prarabdh Chaturvedi", "Shiromi Chaturvedi", "Shubham Choudhary", "Ankur Goyal", "Arun Goyal"],
-                "Team": ["Bansal11", "Xithan XI", "Pretty Panda Prince", "Fairdevil", "TBD", "arun goyal"],
-                "Live Points": ["-", "-", "-", "-", "-", "-"],
-                "Captain": ["TBD", "TBD", "TBD", "TBD", "TBD", "TBD"],
-                "Rank": ["TBD", "TBD", "TBD", "TBD", "TBD", "TBD"]
+                "Player": members['player_name'].tolist(),
+                "Team": members['entry_name'].tolist(),
+                "Live Points": "-",
+                "Captain": "TBD",
+                "Rank": "TBD"
             }
             
             df_preview = pd.DataFrame(preview_data)
-            st.dataframe(df_preview, use_container_width=True, hide_index=True)
+            if df_preview.empty:
+                st.info("League members not loaded yet.")
+            else:
+                st.dataframe(df_preview, use_container_width=True, hide_index=True)
             
             st.caption("📊 Live points and rankings will update automatically during gameweeks")
         
@@ -149,37 +249,91 @@ def main():
             st.info("🔴 **During Live Gameweeks:**\n\nThis section will show live scores, goal scorers, and FPL points as they happen!")
     
     else:
-        # Live gameweek mode (future implementation)
+        # Live gameweek mode
         st.success("🔴 **LIVE GAMEWEEK IN PROGRESS**")
         
+        # Score every tracked manager once (with projected auto-subs); each league tab filters the same table
+        table = live_table(snapshot.picks_matrix, snapshot.points, snapshot.multipliers)
+        
         # Live tracking tabs
-        tab1, tab2, tab3, tab4 = st.tabs(["🔴 Live Scores", "📊 NFO Live", "🏆 QFPL Live", "⚽ Match Center"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔴 Live Scores", f"📊 {HOME_CLUB} Live", "🏆 QFPL Live", "⚔️ H2H Live", "⚽ Match Center"])
         
         with tab1:
             st.subheader("🔴 Live FPL Scoring")
-            # Real-time scoring implementation will go here
+            display_top_scorers(snapshot)
             
         with tab2:
-            st.subheader("📊 NFO Live Leaderboard")
-            # NFO live tracking implementation will go here
+            st.subheader(f"📊 {HOME_CLUB} Live Leaderboard")
+            display_league_live(snapshot, LEAGUE_IDS['NFO_MINI'], table)
             
         with tab3:
             st.subheader("🏆 QFPL Live Standings")
-            # QFPL live tracking implementation will go here
+            display_league_live(snapshot, LEAGUE_IDS['QFPL_MAIN'], table)
             
         with tab4:
+            st.subheader("⚔️ H2H Live")
+            display_h2h_live(snapshot, table)
+            
+        with tab5:
             st.subheader("⚽ Live Match Center")
             # Live match updates implementation will go here
     
+    st.caption(f"📡 Last updated: {datetime.fromtimestamp(snapshot.fetched_at).strftime('%H:%M:%S')}")
+
+def main():
+    # Sidebar Navigation
+    with st.sidebar:
+        st.markdown("### ⚡ GW Live")
+        st.success("Real-time Tracking")
+        
+        st.markdown("### 📊 Navigation")
+        st.page_link("main.py", label="🏠 Home", icon="🏠")
+        st.page_link("pages/1_🏠_NFO_Dashboard.py", label="🌲 NFO Dashboard", icon="🌲")
+        st.page_link("pages/2_📊_QFPL_Dashboard.py", label="🏆 QFPL Dashboard", icon="🏆")
+        st.page_link("pages/3_⚡_GW_Live.py", label="⚡ GW Live", icon="⚡")
+        st.page_link("pages/4_🧠_Intelligence.py", label="🧠 Intelligence", icon="🧠")
+        
+        # Auto-refresh option
+        auto_refresh = st.checkbox("🔄 Auto-refresh", value=False)
+        interval = st.slider("Refresh every (seconds)", 15, 120, LIVE_POLL_SECONDS, step=15, disabled=not auto_refresh)
+        
+        if st.button("🔄 Refresh Now", use_container_width=True):
+            # The page only reads the poller's snapshot, and the poller always revalidates upstream
+            poller.poll_now()
+            st.rerun()
+        
+        st.markdown("---")
+        st.caption("⚡ Live Updates")
+    
+    # Main header
+    st.markdown('<div class="nfo-main-header"><h1>⚡ Gameweek Live Tracking</h1></div>', unsafe_allow_html=True)
+    
+    # Schedule live polling: only while a match is in progress, otherwise wake at the next kickoff
+    snapshot = poller.snapshot
+    current_gw = snapshot.gameweek if snapshot else api.get_current_gameweek()
+    fixtures = snapshot.fixtures if snapshot else []
+    is_live = fixture_status(fixtures)['live'] > 0
+    if snapshot is None:
+        run_every = 2  # Check back shortly for the poller's first snapshot
+    else:
+        run_every = next_poll_delay(fixtures, interval) if auto_refresh else None
+    
+    st.session_state["live_board_page_run"] = True
+    st.fragment(live_board, run_every=run_every)(auto_refresh, is_live, snapshot is None)
+    
     st.markdown("---")
     
     # Footer with live update info
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.caption(f"📡 Last updated: {datetime.now().strftime('%H:%M:%S')}")
+        st.caption(f"📅 Gameweek {current_gw}")
     with col2:
-        if auto_refresh:
-            st.caption("🔄 Auto-refreshing every 30 seconds")
+        if auto_refresh and is_live:
+            st.caption(f"🔄 Auto-refreshing every {interval} seconds")
+        elif auto_refresh and run_every:
+            st.caption("⏸️ Auto-refresh paused until the next kickoff")
+        elif auto_refresh:
+            st.caption("⏸️ Auto-refresh paused - no matches left this gameweek")
         else:
             st.caption("🔄 Manual refresh mode")
     with col3:
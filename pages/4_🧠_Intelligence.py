@@ -4,11 +4,22 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import numpy as np
+import hashlib
 import os
 
 # Import our utilities
 from utils.fpl_api import FPLApiClient
-from utils.constants import LEAGUE_IDS, TEAM_COLORS
+from utils.constants import LEAGUE_IDS, TEAM_COLORS, CAPTAIN_MODEL_PATH, HOME_CLUB
+from utils.live_poller import get_live_poller
+from utils.live_scoring import subset
+from utils.ownership import ownership_summary, differentials
+from utils.similarity import similarity_matrix
+from utils.fixtures import FixtureMatrix, fixtures_revision, MAX_HORIZON, SEASON_GAMEWEEKS
+from utils.transfer_planner import TransferPlanner, projected_points
+from utils.squad_optimizer import optimize_squad, inputs_hash
+from utils.captain_model import feature_table, features_hash, score, captain_candidates, load_model
+from utils.simulator import simulate_league, points_distributions, DEFAULT_SIMULATIONS
+from utils.history_store import get_history_store
 
 # Page config
 st.set_page_config(
@@ -29,6 +40,409 @@ def get_api_client():
     return FPLApiClient()
 
 api = get_api_client()
+poller = get_live_poller(api)
+history = get_history_store()
+
+LEAGUE_CHOICES = {
+    f"🌲 {HOME_CLUB} Mini League": LEAGUE_IDS['NFO_MINI'],
+    "🏆 QFPL Main League": LEAGUE_IDS['QFPL_MAIN'],
+}
+
+def player_lookup():
+    """Element id -> name / position / club table from the bootstrap model"""
+    bootstrap = api.get_bootstrap()
+    if not bootstrap:
+        return pd.DataFrame(columns=['Player', 'Pos', 'Club'])
+    players = bootstrap.players
+    clubs = dict(zip(bootstrap.teams['id'], bootstrap.teams['short_name']))
+    return pd.DataFrame({
+        'Player': players['web_name'].to_numpy(),
+        'Pos': players['element_type'].map(bootstrap.position_name).to_numpy(),
+        'Club': players['team'].map(clubs).to_numpy(),
+    }, index=players['id'].to_numpy())
+
+def league_picks(league_id):
+    """Current gameweek picks matrix, multipliers and members for one league, from the live poller"""
+    snapshot = poller.snapshot
+    if snapshot is None or league_id not in snapshot.members:
+        return None, None, None
+    members = snapshot.members[league_id]
+    rows = np.flatnonzero(np.isin(snapshot.picks_matrix.entries, members['entry']))
+    if len(rows) == 0:
+        return None, None, None
+    return subset(snapshot.picks_matrix, rows), snapshot.multipliers[rows], members
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def league_similarity(league_id, gameweek, entries, squads, _matrix):
+    """All-pairs similarity for a league, computed once per gameweek, members and squads digest"""
+    return similarity_matrix(_matrix)
+
+def display_head_to_head():
+    """Pairwise squad comparison and overlap heatmap read from one precomputed similarity matrix"""
+    st.subheader("⚔️ Head-to-Head Analysis")
+    
+    league_label = st.radio("League", list(LEAGUE_CHOICES), horizontal=True, key="h2h_league")
+    league_id = LEAGUE_CHOICES[league_label]
+    matrix, _, members = league_picks(league_id)
+    if matrix is None or len(matrix.entries) < 2:
+        st.info("📭 Squad comparison needs at least two squads for the current gameweek.")
+        return
+    
+    similarity = league_similarity(league_id, poller.snapshot.gameweek, tuple(matrix.entries),
+                                   hashlib.sha1(np.ascontiguousarray(matrix.elements).tobytes()).hexdigest(), matrix)
+    names = members.set_index('entry')['player_name'].reindex(matrix.entries).fillna('').to_numpy()
+    players = player_lookup()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**👨‍⚔️ Squad Comparison Tool**")
+        first = st.selectbox("Select Player 1", range(len(names)), format_func=lambda i: names[i])
+        second = st.selectbox("Select Player 2", range(len(names)), index=1, format_func=lambda i: names[i])
+        
+        shared = np.intersect1d(matrix.elements[first], matrix.elements[second])
+        st.write("**🤝 Common Players**")
+        st.write(", ".join(players['Player'].reindex(shared).fillna('Unknown')) or "None")
+        
+        # Closest squad to Player 1 other than their own
+        row = similarity.jaccard[first].copy()
+        row[first] = -1
+        closest = int(np.argmax(row))
+        st.write(f"**🪞 Most similar to {names[first]}:** {names[closest]} ({row[closest]:.0%})")
+    
+    with col2:
+        st.write("**📊 Comparison Metrics**")
+        st.metric("Similarity Score", f"{similarity.jaccard[first, second]:.0%}")
+        st.metric("Common Players", f"{similarity.common[first, second]}/15")
+        st.metric("Captaincy-Weighted Similarity", f"{similarity.weighted[first, second]:.0%}")
+        same_captain = (matrix.elements[first][matrix.captain[first]] == matrix.elements[second][matrix.captain[second]]).all()
+        st.metric("Captain Match", "Yes" if same_captain else "No")
+    
+    st.write("**🗺️ Ownership Overlap Matrix**")
+    shown = min(len(names), 40)
+    if shown < len(names):
+        st.caption(f"Showing the top {shown} managers in the league table")
+    order = np.flatnonzero(np.isin(matrix.entries, members['entry'].head(shown)))
+    fig = px.imshow(
+        (100 * similarity.jaccard[np.ix_(order, order)]).round(),
+        x=names[order], y=names[order],
+        color_continuous_scale='Reds', zmin=0, zmax=100,
+        labels={'color': 'Similarity %'},
+    )
+    fig.update_layout(height=max(400, 18 * shown), xaxis_title=None, yaxis_title=None)
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def fixture_matrix(revision, _fixtures):
+    """Difficulty matrix and rolling windows, built once per fixtures revision"""
+    return FixtureMatrix(_fixtures)
+
+def display_fixture_planner():
+    """Rank teams by upcoming fixture difficulty from the precomputed windows"""
+    st.write("**📅 Fixture Difficulty Planner**")
+    
+    fixtures = api.get_fixtures()
+    bootstrap = api.get_bootstrap()
+    if not fixtures or not bootstrap:
+        st.info("📭 Fixture data is unavailable right now.")
+        return
+    matrix = fixture_matrix(fixtures_revision(fixtures), fixtures)
+    short_names = dict(zip(bootstrap.teams['id'].astype(int), bootstrap.teams['short_name']))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        start = st.number_input("From gameweek", 1, matrix.n_gameweeks,
+                                bootstrap.next_event or bootstrap.current_event or 1)
+    with col2:
+        horizon = st.slider("Next N gameweeks", 1, MAX_HORIZON, 5)
+    
+    ranking = matrix.ranking(start, horizon, list(short_names))
+    opponents = matrix.opponents(start, horizon)
+    
+    def fixture_list(team):
+        rows = opponents.get(team)
+        if rows is None:
+            return "-"
+        return " ".join(f"{short_names.get(o, '?')}({'H' if home else 'A'})" for o, home in zip(rows['opponent'], rows['home']))
+    
+    st.dataframe(pd.DataFrame({
+        'Team': ranking['team'].map(short_names),
+        'Fixtures': ranking['team'].map(fixture_list),
+        'Games': ranking['fixtures'],
+        'Avg FDR': ranking['average_difficulty'].round(2),
+        'Ease': ranking['ease'],
+    }), use_container_width=True, hide_index=True)
+    st.caption("Ease adds 6 − FDR for every fixture, so double gameweeks score twice and blanks score nothing.")
+    
+    teams = ranking['team'].to_numpy()
+    grid = matrix.average_difficulty(start, MAX_HORIZON)[teams]
+    fig = px.imshow(
+        grid,
+        x=[f"GW{gw}" for gw in range(start, start + grid.shape[1])],
+        y=[short_names[team] for team in teams],
+        color_continuous_scale='RdYlGn_r', zmin=1, zmax=5,
+        labels={'color': 'FDR'},
+    )
+    fig.update_layout(height=600, xaxis_title=None, yaxis_title=None)
+    st.plotly_chart(fig, use_container_width=True)
+
+def display_transfer_planner():
+    """Best hold / 1 / 2 transfer moves for a home club manager over the next few gameweeks"""
+    st.write("**🔁 Transfer Planner**")
+    
+    fixtures = api.get_fixtures()
+    bootstrap = api.get_bootstrap()
+    members = api.get_league_standings_df(LEAGUE_IDS['NFO_MINI'])
+    if not fixtures or not bootstrap or members.empty:
+        st.info("📭 Transfer planning needs bootstrap, fixture and league data.")
+        return
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        names = dict(zip(members['entry'], members['player_name'].fillna(members['entry_name'])))
+        entry = st.selectbox("Manager", list(names), format_func=names.get, key="planner_entry")
+    with col2:
+        free_transfers = st.number_input("Free transfers", 0, 5, 1, key="planner_free")
+    with col3:
+        horizon = st.slider("Horizon (GWs)", 1, MAX_HORIZON, 3, key="planner_horizon")
+    
+    picks = api.get_team_picks(entry, bootstrap.current_event or 1)
+    if not picks:
+        st.info("📭 No picks available for this manager yet.")
+        return
+    
+    start = bootstrap.next_event or bootstrap.current_event or 1
+    matrix = fixture_matrix(fixtures_revision(fixtures), fixtures)
+    planner = TransferPlanner(bootstrap, projected_points(bootstrap, matrix, start, horizon))
+    squad = [pick['element'] for pick in picks['picks']]
+    bank = (picks.get('entry_history') or {}).get('bank', 0)
+    plans = planner.plan(squad, bank, free_transfers)
+    
+    players = player_lookup()['Player']
+    def player_names(ids):
+        return ", ".join(players.reindex(ids).fillna('Unknown')) or "Hold"
+    
+    best = plans.iloc[0]
+    st.metric("Best Move", player_names(best['in']) if best['transfers'] else "Hold",
+              f"{best['net_gain']:+.1f} pts over GW{start}-{start + horizon - 1}")
+    st.dataframe(pd.DataFrame({
+        'Out': plans['out'].map(player_names),
+        'In': plans['in'].map(player_names),
+        'Hit': -plans['hit'],
+        'Projected Gain': plans['gain'].round(1),
+        'Net Gain': plans['net_gain'].round(1),
+        'Bank After': (plans['bank'] / 10).map(lambda m: f"£{m:.1f}m"),
+    }), use_container_width=True, hide_index=True)
+    st.caption("Projections scale each player's expected points by fixture ease; outgoing players are valued at current price.")
+
+@st.cache_data(max_entries=16, show_spinner="Solving squad...")
+def solve_squad(key, _bootstrap, _points, budget, locked, banned):
+    """MILP squad solution, cached per inputs hash"""
+    return optimize_squad(_bootstrap, _points, budget, locked, banned)
+
+def display_squad_optimizer():
+    """Wildcard / Free Hit draft: best 15 from the whole pool under budget, quota and club limits"""
+    st.write("**🧩 Squad Optimizer**")
+    
+    fixtures = api.get_fixtures()
+    bootstrap = api.get_bootstrap()
+    if not fixtures or not bootstrap:
+        st.info("📭 Squad optimization needs bootstrap and fixture data.")
+        return
+    
+    players = player_lookup()
+    labels = (players['Player'] + " (" + players['Club'].fillna('') + ", " + players['Pos'].fillna('') + ")").to_dict()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        mode = st.radio("Chip", ["Wildcard", "Free Hit"], horizontal=True, key="optimizer_mode")
+    with col2:
+        # A Free Hit squad only has to last one gameweek
+        horizon = 1 if mode == "Free Hit" else st.slider("Horizon (GWs)", 1, MAX_HORIZON, 5, key="optimizer_horizon")
+    with col3:
+        budget = st.number_input("Budget (£m)", 80.0, 120.0, 100.0, step=0.1, key="optimizer_budget")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        locked = st.multiselect("Lock players", list(labels), format_func=labels.get, key="optimizer_locked")
+    with col2:
+        banned = st.multiselect("Ban players", list(labels), format_func=labels.get, key="optimizer_banned")
+    
+    start = bootstrap.next_event or bootstrap.current_event or 1
+    matrix = fixture_matrix(fixtures_revision(fixtures), fixtures)
+    points = projected_points(bootstrap, matrix, start, horizon)
+    budget = int(round(budget * 10))
+    key = inputs_hash(bootstrap, points, budget, locked, banned)
+    if not st.button("⚙️ Optimize Squad", key="optimizer_run") and key != st.session_state.get("optimizer_key"):
+        return
+    st.session_state["optimizer_key"] = key
+    solution = solve_squad(key, bootstrap, points, budget, tuple(locked), tuple(banned))
+    if solution is None:
+        st.error("No valid squad fits these constraints - loosen the budget, locks or bans.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Projected Points", f"{solution.projected_points:.1f}", f"GW{start}-{start + horizon - 1}")
+    col2.metric("Squad Cost", f"£{solution.cost / 10:.1f}m")
+    col3.metric("Solve Time", f"{solution.solve_seconds:.2f}s")
+    
+    squad = players.reindex(solution.squad)
+    roles = ["©️ Captain" if e == solution.captain else "XI" if e in solution.starters else "Bench" for e in solution.squad]
+    squad['Role'] = roles
+    squad['Cost'] = (bootstrap.players.set_index('id')['now_cost'].reindex(solution.squad) / 10).map(lambda m: f"£{m:.1f}m")
+    squad['Projected'] = points[solution.squad].round(1)
+    squad['order'] = [["©️ Captain", "XI", "Bench"].index(role) for role in roles]
+    squad = squad.sort_values(['order', 'Pos'])
+    st.dataframe(squad[['Player', 'Pos', 'Club', 'Role', 'Cost', 'Projected']], use_container_width=True, hide_index=True)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def captain_features(revision, gameweek, players_key, _bootstrap, _matrix):
+    """Feature table for every player, rebuilt when fixtures, gameweek or the player inputs it reads change"""
+    return feature_table(_bootstrap, _matrix, gameweek)
+
+@st.cache_resource(show_spinner=False)
+def captain_model(modified):
+    """Trained coefficients, reloaded when the model file changes"""
+    return load_model()
+
+def display_captain_predictor():
+    """Top captain options for every home club squad, scored from one cached feature table"""
+    st.write("**🎯 Captain Predictor**")
+    
+    fixtures = api.get_fixtures()
+    bootstrap = api.get_bootstrap()
+    matrix, multipliers, members = league_picks(LEAGUE_IDS['NFO_MINI'])
+    if not fixtures or not bootstrap or matrix is None:
+        st.info(f"📭 Captain predictions will appear once {HOME_CLUB} picks and fixtures are available.")
+        return
+    
+    gameweek = bootstrap.next_event or bootstrap.current_event or 1
+    revision = fixtures_revision(fixtures)
+    table = captain_features(revision, gameweek, features_hash(bootstrap), bootstrap, fixture_matrix(revision, fixtures))
+    model = captain_model(os.path.getmtime(CAPTAIN_MODEL_PATH) if os.path.exists(CAPTAIN_MODEL_PATH) else None)
+    candidates = captain_candidates(matrix, score(table, model['coefficients']))
+    
+    players = player_lookup()
+    names = dict(zip(members['entry'], members['player_name']))
+    candidates['Pick'] = players['Player'].reindex(candidates['element']).fillna('Unknown').to_numpy()
+    candidates['Pick'] += " (" + candidates['expected_points'].round(1).astype(str) + ")"
+    options = candidates.pivot(index='entry', columns='option', values='Pick')
+    options.columns = [f"Option {option}" for option in options.columns]
+    options.index = options.index.map(names).rename('Manager')
+    st.dataframe(options, use_container_width=True)
+    if model['trained_at']:
+        st.caption(f"GW{gameweek} expected points. Model trained on {model['rows']:,} player-gameweeks (RMSE {model['rmse']:.2f}).")
+    else:
+        st.caption(f"GW{gameweek} expected points from default weights - run `python -m utils.captain_model` to train.")
+
+@st.cache_data(max_entries=8, show_spinner="Simulating the season...")
+def season_outlook(league_id, standings_key, gameweeks, simulations, _standings, remaining):
+    """Finishing probabilities per manager, cached per standings and stored history"""
+    entries = _standings['entry'].astype(int).tolist()
+    points = history.entry_points(entries)
+    if not points.empty:
+        points = points.assign(points=points['points'] - points['event_transfers_cost'].fillna(0))
+    means, stds = points_distributions(points, entries)
+    # In-process: forking worker processes out of the threaded Streamlit server can deadlock
+    return simulate_league(entries, _standings['total'], means, stds, remaining, simulations, seed=gameweeks)
+
+def display_season_simulator():
+    """Title, top-3 and relegation odds from a Monte Carlo run of the remaining gameweeks"""
+    st.write("**🎲 Season Simulator**")
+    
+    bootstrap = api.get_bootstrap()
+    col1, col2 = st.columns(2)
+    with col1:
+        league_label = st.radio("League", list(LEAGUE_CHOICES), horizontal=True, key="simulator_league")
+    with col2:
+        simulations = st.select_slider("Simulations", [10_000, 50_000, DEFAULT_SIMULATIONS, 250_000],
+                                       value=DEFAULT_SIMULATIONS, key="simulator_runs")
+    league_id = LEAGUE_CHOICES[league_label]
+    standings = api.get_league_standings_df(league_id)
+    if 'total' in standings:
+        standings = standings[standings['section'] == 'standings']
+    if not bootstrap or 'total' not in standings or standings.empty:
+        st.info("📭 Season simulation needs current league standings.")
+        return
+    
+    remaining = SEASON_GAMEWEEKS - (bootstrap.current_event or 0)
+    gameweeks = history.ingested_gameweeks()
+    standings_key = tuple(zip(standings['entry'].astype(int), standings['total'].astype(int)))
+    run_key = (league_id, standings_key, tuple(gameweeks), simulations)
+    if not st.button("🎲 Run Simulation", key="simulator_run") and run_key != st.session_state.get("simulator_key"):
+        return
+    st.session_state["simulator_key"] = run_key
+    outlook = season_outlook(league_id, standings_key, len(gameweeks), simulations, standings, remaining)
+    
+    names = dict(zip(standings['entry'].astype(int), standings['player_name']))
+    totals = dict(zip(standings['entry'].astype(int), standings['total']))
+    st.dataframe(pd.DataFrame({
+        'Manager': outlook['entry'].map(names),
+        'Points': outlook['entry'].map(totals),
+        'Expected Rank': outlook['expected_rank'].round(1),
+        'Title %': (outlook['title'] * 100).round(1),
+        'Top 3 %': (outlook['top3'] * 100).round(1),
+        'Relegation %': (outlook['relegation'] * 100).round(1),
+    }), use_container_width=True, hide_index=True)
+    if len(gameweeks) < 3:
+        st.caption(f"{remaining} gameweeks left. Little stored history yet, so most managers share the league-wide points distribution.")
+    else:
+        st.caption(f"{simulations:,} simulations of the remaining {remaining} gameweeks from each manager's stored points history.")
+
+def display_squad_intelligence():
+    """Popular picks and differentials from the league's sparse ownership matrix"""
+    st.subheader("👥 Squad Intelligence")
+    
+    league_label = st.radio("League", list(LEAGUE_CHOICES), horizontal=True, key="squad_league")
+    matrix, multipliers, members = league_picks(LEAGUE_CHOICES[league_label])
+    if matrix is None:
+        st.info("📭 Squad analysis will appear once picks are available for the current gameweek.")
+        return
+    
+    players = player_lookup()
+    summary = ownership_summary(matrix, multipliers).join(players, on='element')
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.write("**🔍 Popular Picks Analysis**")
+        popular = summary.head(15)
+        st.dataframe(pd.DataFrame({
+            'Player': popular['Player'],
+            'Pos': popular['Pos'],
+            'Club': popular['Club'],
+            'Owners': popular['owners'],
+            'Owned %': popular['ownership'].round(1),
+            'Captain %': popular['captaincy'].round(1),
+            'EO %': popular['effective_ownership'].round(1),
+        }), use_container_width=True, hide_index=True)
+        
+        st.write("**🎯 Differential Finder**")
+        max_ownership = st.slider("Max ownership %", 0, 50, 0, step=5, help="0 = picks nobody else in the league owns")
+        diffs = differentials(matrix, multipliers, max_ownership or None).join(players, on='element')
+        if diffs.empty:
+            st.info("No differentials at this ownership level.")
+        else:
+            by_manager = diffs.groupby('entry').agg(
+                Differentials=('Player', lambda names: ", ".join(names.dropna())),
+                Count=('element', 'size'),
+            ).reset_index()
+            by_manager = members.merge(by_manager, on='entry').sort_values('Count', ascending=False)
+            st.dataframe(by_manager.rename(columns={'player_name': 'Manager', 'entry_name': 'Team'})
+                         [['Manager', 'Team', 'Count', 'Differentials']],
+                         use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.write("**🎯 Quick Stats**")
+        st.metric("Managers", str(len(members)))
+        st.metric("Squads Loaded", str(len(matrix.entries)))
+        st.metric("Unique Players", str(len(summary)))
+        st.metric("Most Popular", summary['Player'].iloc[0] if not summary.empty else "-")
+        
+        st.write("**🔥 Hot Picks**")
+        captains = summary.sort_values('captaincy', ascending=False).head(3)
+        for _, row in captains[captains['captaincy'] > 0].iterrows():
+            st.write(f"©️ {row['Player']} - {row['captaincy']:.0f}% captaincy")
 
 
 def main():
@@ -48,7 +462,8 @@ def main():
         st.info("Advanced insights and predictions")
         
         if st.button("🔄 Refresh Data", help="Refresh intelligence data", use_container_width=True):
-            st.cache_data.clear()
+            # Squad data comes from the live poller's snapshot
+            poller.poll_now()
             st.rerun()
         
         st.markdown("---")
@@ -77,79 +492,10 @@ def main():
     tab1, tab2, tab3, tab4 = st.tabs(["👥 Squad Intelligence", "⚔️ Head-to-Head Analysis", "🔄 Transfer Intelligence", "🎯 Strategy Center"])
     
     with tab1:
-        st.subheader("👥 Squad Intelligence")
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.write("**🔍 NFO Squad Analysis**")
-            st.info("🚧 **Coming Tomorrow!**\n\nAdvanced squad analysis will include:\n- Popular picks among NFO players\n- Ownership overlap analysis\n- Squad value distribution\n- Position-wise breakdowns")
-            
-            # Preview functionality
-            st.write("**📊 Features Preview:**")
-            feature_data = {
-                "Feature": [
-                    "Popular Picks Analysis", 
-                    "Ownership Overlap Matrix", 
-                    "Squad Value Comparison", 
-                    "Formation Analysis",
-                    "Differential Finder"
-                ],
-                "Status": ["Ready", "Ready", "Ready", "Ready", "Ready"],
-                "Description": [
-                    "Most owned players across NFO team",
-                    "Visual overlap of player selections",
-                    "Team value distribution analysis", 
-                    "Formation and strategy insights",
-                    "Unique picks only you have"
-                ]
-            }
-            
-            df_features = pd.DataFrame(feature_data)
-            st.dataframe(df_features, use_container_width=True, hide_index=True)
-        
-        with col2:
-            st.write("**🎯 Quick Stats**")
-            st.metric("NFO Players", "6")
-            st.metric("Total Squads", "6")
-            st.metric("Unique Players", "TBD")
-            st.metric("Most Popular", "TBD")
-            
-            st.write("**🔥 Hot Picks**")
-            st.info("Popular players analysis coming soon!")
+        display_squad_intelligence()
     
     with tab2:
-        st.subheader("⚔️ Head-to-Head Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**👨‍⚔️ Squad Comparison Tool**")
-            st.info("🚧 **Coming Tomorrow!**\n\nCompare any two NFO players' squads with:\n- Side-by-side team comparison\n- Similarity scoring\n- Position-wise analysis\n- Captain choice comparison")
-            
-            # Preview selectors (will be functional tomorrow)
-            st.selectbox("Select Player 1", ["Jay Bansal", "Prarabdh Chaturvedi", "Shiromi Chaturvedi", "Shubham Choudhary", "Ankur Goyal", "Arun Goyal"], disabled=True)
-            st.selectbox("Select Player 2", ["Jay Bansal", "Prarabdh Chaturvedi", "Shiromi Chaturvedi", "Shubham Choudhary", "Ankur Goyal", "Arun Goyal"], disabled=True)
-            
-            if st.button("🔍 Compare Squads", disabled=True):
-                st.info("Comparison feature coming tomorrow!")
-        
-        with col2:
-            st.write("**📊 Comparison Metrics**")
-            st.write("**Similarity Score:** TBD%")
-            st.write("**Common Players:** TBD/15")
-            st.write("**Value Difference:** £TBD")
-            st.write("**Formation Match:** TBD")
-            
-            st.write("**🎯 Analysis Categories:**")
-            st.markdown("""
-            - **Goalkeepers:** Compare GK choices
-            - **Defense:** Defensive strategies  
-            - **Midfield:** Midfield selections
-            - **Attack:** Forward choices
-            - **Captain:** Leadership picks
-            - **Bench:** Backup strategies
-            """)
+        display_head_to_head()
     
     with tab3:
         st.subheader("🔄 Transfer Intelligence")
@@ -158,15 +504,16 @@ def main():
         
         with col1:
             st.write("**📈 Transfer Tracking**")
-            st.info("🚧 **Coming Tomorrow!**\n\nTransfer intelligence will track:\n- All NFO player transfers\n- Popular transfer trends\n- Transfer timing analysis\n- Success rate tracking")
+            st.info(f"🚧 **Coming Tomorrow!**\n\nTransfer intelligence will track:\n- All {HOME_CLUB} player transfers\n- Popular transfer trends\n- Transfer timing analysis\n- Success rate tracking")
             
             # Preview transfer data
             st.write("**📊 Transfer Activity Preview:**")
+            managers = api.get_league_standings_df(LEAGUE_IDS['NFO_MINI']).reindex(columns=['player_name']).head(3)
             transfer_preview = {
-                "Player": ["Jay Bansal", "Prarabdh Chaturvedi", "Shiromi Chaturvedi"],
-                "Transfers Made": ["0", "0", "0"],
-                "Last Transfer": ["None", "None", "None"],
-                "Transfer Value": ["£0.0m", "£0.0m", "£0.0m"]
+                "Player": managers['player_name'].tolist(),
+                "Transfers Made": "0",
+                "Last Transfer": "None",
+                "Transfer Value": "£0.0m"
             }
             
             df_transfers = pd.DataFrame(transfer_preview)
@@ -184,21 +531,27 @@ def main():
     with tab4:
         st.subheader("🎯 Strategy Center")
         
+        display_fixture_planner()
+        display_transfer_planner()
+        display_squad_optimizer()
+        display_captain_predictor()
+        display_season_simulator()
+        
         col1, col2 = st.columns(2)
         
         with col1:
             st.write("**🎮 Strategy Tools**")
-            st.info("🚧 **Future Features:**\n\n- Fixture difficulty analysis\n- Captain prediction AI\n- Transfer timing optimizer\n- Chip usage strategies\n- Risk/reward analysis")
+            st.info("🚧 **Future Features:**\n\n- Chip usage strategies")
             
             st.write("**🏆 AI Recommendations**")
-            st.warning("⚠️ **Coming Soon:**\n\nAI-powered strategic recommendations based on:\n- NFO team patterns\n- Historical performance\n- Fixture analysis\n- Ownership data")
+            st.warning(f"⚠️ **Coming Soon:**\n\nAI-powered strategic recommendations based on:\n- {HOME_CLUB} team patterns\n- Historical performance\n- Fixture analysis\n- Ownership data")
         
         with col2:
             st.write("**📊 Strategic Insights**")
             
             strategy_metrics = {
                 "Category": ["Captain Choices", "Formation", "Budget Distribution", "Risk Level"],
-                "NFO Average": ["TBD", "TBD", "TBD", "TBD"],
+                f"{HOME_CLUB} Average": ["TBD", "TBD", "TBD", "TBD"],
                 "Recommendation": ["Data needed", "Data needed", "Data needed", "Data needed"]
             }
             
@@ -225,14 +578,14 @@ def main():
     
     with roadmap_col2:
         st.write("**📅 This Week**")
-        st.info("🔄 Fixture Analysis")
-        st.info("🔄 Captain Predictor")
+        st.success("✅ Fixture Analysis")
+        st.success("✅ Captain Predictor")
         st.info("🔄 Strategy Optimizer")
     
     with roadmap_col3:
         st.write("**📅 Season Launch**")
         st.warning("⏳ AI Recommendations")
-        st.warning("⏳ Performance Prediction")
+        st.success("✅ Performance Prediction")
         st.warning("⏳ Advanced Analytics")
     
     # Footer
@@ -0,0 +1,91 @@
+"""Backfill the season history store for every tracked entry.
+
+    python -m utils.backfill [--league ID ...] [--rate N] [--batch N] [--dry-run]
+
+Missing (entry, gameweek) pairs are planned against what is already
+stored, then fetched concurrently under a token-bucket rate limit and
+committed batch by batch. Every committed batch is a checkpoint: an
+interrupted run picks up from the first unstored pair, and re-running
+after a new gameweek only fetches that gameweek.
+"""
+import argparse
+from utils.constants import BACKFILL_REQUESTS_PER_SECOND, BACKFILL_BATCH_SIZE
+from utils.fpl_api import FPLApiClient
+from utils.history_store import HistoryStore
+from utils.ingest import TRACKED_LEAGUES, entry_starts, last_finished_gameweek, tracked_entries
+from utils.rate_limit import TokenBucket
+
+
+def plan_backfill(store, starts, last_gameweek):
+    """Sorted (gameweek, entry) pairs from each entry's first gameweek to last_gameweek not yet stored"""
+    stored = store.stored_pairs(starts)
+    return sorted(
+        (gameweek, entry)
+        for entry, start in starts.items()
+        for gameweek in range(start, last_gameweek + 1)
+        if (entry, gameweek) not in stored
+    )
+
+
+def run_backfill(api, store, league_ids=TRACKED_LEAGUES, rate=BACKFILL_REQUESTS_PER_SECOND,
+                 batch_size=BACKFILL_BATCH_SIZE, dry_run=False, log=print):
+    """Fetch and store every missing (entry, gameweek) pair; returns the number of pairs written"""
+    bootstrap = api.get_bootstrap()
+    last_gameweek = last_finished_gameweek(bootstrap) if bootstrap else None
+    if last_gameweek is None:
+        log("No finished gameweek yet - nothing to backfill")
+        return 0
+
+    bucket = TokenBucket(rate)
+    standings, entries = tracked_entries(api, league_ids)
+    # An entry whose summary fails plans from GW1, so its gameweeks stay unsealed until a re-run resolves it
+    starts = entry_starts(api, store, entries, bucket.limit(api.get_entry))
+    pairs = plan_backfill(store, starts, last_gameweek)
+    log(f"{len(entries)} entries, GW1-{last_gameweek}: {len(pairs)} (entry, gameweek) pairs to fetch")
+    if dry_run or not pairs:
+        return 0
+
+    # One transfers call per entry covers its whole season
+    pending = sorted({entry for _, entry in pairs})
+    transfers = dict(zip(pending, api.fetch_many((bucket.limit(api.get_entry_transfers), entry) for entry in pending)))
+
+    written = 0
+    get_picks = bucket.limit(api.get_team_picks)
+    for start in range(0, len(pairs), batch_size):
+        batch = pairs[start:start + batch_size]
+        results = api.fetch_many((get_picks, entry, gameweek) for gameweek, entry in batch)
+        by_gameweek = {}
+        for (gameweek, entry), data in zip(batch, results):
+            if data:
+                by_gameweek.setdefault(gameweek, {})[entry] = data
+        for gameweek, picks in by_gameweek.items():
+            store.write_gameweek(gameweek, picks=picks, transfers={e: transfers.get(e) for e in picks}, seal=False)
+        written += sum(len(picks) for picks in by_gameweek.values())
+        log(f"  {min(start + batch_size, len(pairs))}/{len(pairs)} fetched, {written} stored")
+
+    # Standings and player prices only describe the present, so they belong to the last finished gameweek
+    sealed = set(store.ingested_gameweeks())
+    if last_gameweek not in sealed:
+        store.write_gameweek(last_gameweek, players=bootstrap.players, standings=standings, seal=False)
+    remaining = plan_backfill(store, starts, last_gameweek)
+    incomplete = {gameweek for gameweek, _ in remaining}
+    for gameweek in range(1, last_gameweek + 1):
+        if gameweek not in sealed and gameweek not in incomplete:
+            store.seal_gameweek(gameweek, bootstrap.event(gameweek))
+    if remaining:
+        log(f"{len(remaining)} pairs still missing - re-run to retry them")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill season history for tracked leagues")
+    parser.add_argument('--league', type=int, action='append', help="League id to track (repeatable, defaults to QFPL and every club mini league)")
+    parser.add_argument('--rate', type=float, default=BACKFILL_REQUESTS_PER_SECOND, help="Upstream requests per second")
+    parser.add_argument('--batch', type=int, default=BACKFILL_BATCH_SIZE, help="Pairs fetched per checkpoint")
+    parser.add_argument('--dry-run', action='store_true', help="Only print the plan")
+    args = parser.parse_args()
+    run_backfill(FPLApiClient(), HistoryStore(), tuple(args.league or TRACKED_LEAGUES), args.rate, args.batch, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
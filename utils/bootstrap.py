@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Columns kept from bootstrap-static; everything else in the payload is dropped
+PLAYER_COLUMNS = {
+    'id': 'int32', 'web_name': 'string', 'first_name': 'string', 'second_name': 'string',
+    'team': 'int16', 'element_type': 'int8', 'status': 'category', 'now_cost': 'int16',
+    'total_points': 'int16', 'minutes': 'int32', 'form': 'float32', 'points_per_game': 'float32',
+    'selected_by_percent': 'float32', 'ep_next': 'float32', 'ict_index': 'float32',
+    'chance_of_playing_next_round': 'float32',
+}
+TEAM_COLUMNS = {
+    'id': 'int16', 'name': 'string', 'short_name': 'string', 'strength': 'int8',
+}
+POSITION_COLUMNS = {
+    'id': 'int8', 'singular_name_short': 'string', 'squad_select': 'int8',
+    'squad_min_play': 'int8', 'squad_max_play': 'int8',
+}
+EVENT_COLUMNS = {
+    'id': 'int16', 'name': 'string', 'deadline_time': 'string', 'finished': 'bool',
+    'data_checked': 'bool', 'is_previous': 'bool', 'is_current': 'bool', 'is_next': 'bool',
+    'average_entry_score': 'int16', 'highest_score': 'int16',
+}
+
+
+def _frame(records, columns):
+    """Build a compact DataFrame from a list of dicts, casting to the given dtypes"""
+    df = pd.DataFrame.from_records(records, columns=list(columns))
+    for column, dtype in columns.items():
+        if dtype.startswith(('int', 'float')):
+            # Several numeric fields arrive as strings ("5.5") or null
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+            if dtype.startswith('int'):
+                df[column] = df[column].fillna(0)
+        df[column] = df[column].astype(dtype)
+    return df
+
+
+def _dense_index(ids):
+    """Array mapping id -> row position (-1 where the id is absent)"""
+    index = np.full(int(ids.max()) + 1 if len(ids) else 1, -1, dtype=np.int32)
+    index[ids] = np.arange(len(ids), dtype=np.int32)
+    return index
+
+
+def _group_rows(keys):
+    """Dict of key -> array of row positions, in original row order"""
+    order = np.argsort(keys, kind='stable')
+    unique, starts = np.unique(keys[order], return_index=True)
+    return {int(key): rows for key, rows in zip(unique, np.split(order, starts[1:]))}
+
+
+class Bootstrap:
+    """Columnar model of bootstrap-static with precomputed lookups.
+
+    Players, teams, positions (element_types) and events are compact
+    DataFrames; id lookups go through dense arrays and team/position
+    membership through prebuilt row groups, so nothing walks the raw JSON.
+    """
+
+    def __init__(self, data):
+        self.players = _frame(data['elements'], PLAYER_COLUMNS)
+        self.teams = _frame(data['teams'], TEAM_COLUMNS)
+        self.positions = _frame(data['element_types'], POSITION_COLUMNS)
+        self.events = _frame(data['events'], EVENT_COLUMNS)
+
+        self._player_row = _dense_index(self.players['id'].to_numpy())
+        self._team_row = _dense_index(self.teams['id'].to_numpy())
+        self._event_row = _dense_index(self.events['id'].to_numpy())
+        self._rows_by_team = _group_rows(self.players['team'].to_numpy())
+        self._rows_by_position = _group_rows(self.players['element_type'].to_numpy())
+        self._position_names = dict(zip(self.positions['id'].astype(int), self.positions['singular_name_short']))
+
+        self.current_event = self._flagged_event('is_current')
+        self.next_event = self._flagged_event('is_next')
+
+    def _flagged_event(self, flag):
+        ids = self.events.loc[self.events[flag], 'id']
+        return int(ids.iloc[0]) if len(ids) else None
+
+    def player_rows(self, element_ids):
+        """Row positions for an array of element ids (-1 for unknown ids)"""
+        element_ids = np.asarray(element_ids, dtype=np.int64)
+        rows = np.full(element_ids.shape, -1, dtype=np.int32)
+        known = (element_ids >= 0) & (element_ids < len(self._player_row))
+        rows[known] = self._player_row[element_ids[known]]
+        return rows
+
+    def element_vector(self, column, fill=0):
+        """Array indexed by element id holding one player column (fill for unknown ids)"""
+        values = self.players[column].to_numpy()
+        vector = np.full(len(self._player_row), fill, dtype=values.dtype)
+        vector[self.players['id'].to_numpy()] = values
+        return vector
+
+    def player(self, element_id):
+        """Single player as a Series, or None"""
+        row = self.player_rows([element_id])[0]
+        return self.players.iloc[row] if row >= 0 else None
+
+    def team(self, team_id):
+        """Single team as a Series, or None"""
+        if not 0 <= team_id < len(self._team_row) or self._team_row[team_id] < 0:
+            return None
+        return self.teams.iloc[self._team_row[team_id]]
+
+    def event(self, event_id):
+        """Single event (gameweek) as a Series, or None"""
+        if not 0 <= event_id < len(self._event_row) or self._event_row[event_id] < 0:
+            return None
+        return self.events.iloc[self._event_row[event_id]]
+
+    def team_players(self, team_id):
+        """All players of a Premier League team"""
+        return self.players.iloc[self._rows_by_team.get(team_id, [])]
+
+    def position_players(self, element_type):
+        """All players of a position (1=GKP, 2=DEF, 3=MID, 4=FWD)"""
+        return self.players.iloc[self._rows_by_position.get(element_type, [])]
+
+    def position_name(self, element_type):
+        """Short position name such as 'MID'"""
+        return self._position_names.get(element_type, '')
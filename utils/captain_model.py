@@ -0,0 +1,181 @@
+"""Captain expected-points model.
+
+    python -m utils.captain_model [--players N] [--rate N]
+
+Training is offline: the command above pulls element-summary histories,
+fits a linear model by least squares and writes its coefficients to
+CAPTAIN_MODEL_PATH. The app only loads those coefficients and scores the
+whole bootstrap pool with one matrix-vector product.
+"""
+import argparse
+import hashlib
+import json
+import time
+import numpy as np
+import pandas as pd
+from utils.constants import CAPTAIN_MODEL_PATH, BACKFILL_REQUESTS_PER_SECOND
+from utils.fixtures import FixtureMatrix
+from utils.live_scoring import gather
+from utils.rate_limit import TokenBucket
+
+RECENT_ROUNDS = 4  # Roughly the 30-day window FPL uses for `form`
+
+# Per-player inputs for one target gameweek. The first three are scaled by
+# the number of fixtures that gameweek, so blanks score ~0 and doubles ~2x.
+FEATURES = ('recent_points', 'season_ppg', 'minutes_share', 'ease', 'home', 'fixtures', 'bias')
+
+# Used until a model has been trained
+DEFAULT_COEFFICIENTS = {
+    'recent_points': 0.45, 'season_ppg': 0.45, 'minutes_share': 1.0,
+    'ease': 0.2, 'home': 0.3, 'fixtures': -0.5, 'bias': 0.0,
+}
+
+
+def fixture_features(matrix, teams, gameweek):
+    """(fixtures, ease, home fixtures) for each team id in `teams` in one gameweek"""
+    if gameweek > matrix.n_gameweeks:
+        return np.zeros(len(teams)), np.zeros(len(teams)), np.zeros(len(teams))
+    rows = matrix.rows[matrix.rows['event'] == gameweek]
+    home = np.zeros(matrix.cells['fixtures'].shape[0])
+    np.add.at(home, rows['team'].to_numpy(), rows['home'].to_numpy().astype(float))
+    return matrix.cells['fixtures'][teams, gameweek], matrix.cells['ease'][teams, gameweek], home[teams]
+
+
+def _design(recent_points, season_ppg, minutes_share, fixtures, ease, home):
+    """Stack raw inputs into the FEATURES columns"""
+    return np.column_stack([
+        recent_points * fixtures, season_ppg * fixtures, minutes_share * fixtures,
+        ease, home, fixtures, np.ones(len(fixtures)),
+    ])
+
+
+def feature_table(bootstrap, matrix, gameweek):
+    """(max element id + 1, len(FEATURES)) features for every bootstrap player, rows indexed by element id.
+
+    form, points_per_game and season minutes stand in for the rolling
+    history the model was trained on.
+    """
+    players = bootstrap.players
+    teams = players['team'].to_numpy().astype(np.int64)
+    played_rounds = max(gameweek - 1, 1)
+    fixtures, ease, home = fixture_features(matrix, teams, gameweek)
+    design = _design(
+        players['form'].fillna(0).to_numpy(dtype=float),
+        players['points_per_game'].fillna(0).to_numpy(dtype=float),
+        np.minimum(players['minutes'].to_numpy(dtype=float) / (90 * played_rounds), 1.0),
+        fixtures, ease, home,
+    )
+    chance = players['chance_of_playing_next_round'].to_numpy(dtype=float)
+    table = np.zeros((int(players['id'].max()) + 1 if len(players) else 1, len(FEATURES) + 1))
+    table[players['id'].to_numpy(), :-1] = design
+    # Last column is availability, applied after the linear model
+    table[players['id'].to_numpy(), -1] = np.where(np.isnan(chance), 1.0, chance / 100)
+    return table
+
+
+def features_hash(bootstrap):
+    """Key for caching a feature_table: a digest of every bootstrap column it reads"""
+    digest = hashlib.sha1()
+    for column in ('id', 'team', 'form', 'points_per_game', 'minutes', 'chance_of_playing_next_round'):
+        digest.update(pd.to_numeric(bootstrap.players[column], errors='coerce').to_numpy(dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def score(table, coefficients):
+    """Expected points by element id for a whole feature table in one product"""
+    weights = np.array([coefficients.get(feature, 0.0) for feature in FEATURES])
+    return np.maximum(table[:, :-1] @ weights, 0) * table[:, -1]
+
+
+def captain_candidates(picks_matrix, scores, top=3):
+    """DataFrame of each manager's `top` captain options: entry, option, element, expected_points"""
+    squad_scores = gather(scores, picks_matrix.elements)
+    order = np.argsort(-squad_scores, axis=1, kind='stable')[:, :top]
+    rows = np.arange(len(picks_matrix.entries))[:, None]
+    return pd.DataFrame({
+        'entry': np.repeat(picks_matrix.entries, order.shape[1]),
+        'option': np.tile(np.arange(1, order.shape[1] + 1), len(picks_matrix.entries)),
+        'element': picks_matrix.elements[rows, order].ravel(),
+        'expected_points': squad_scores[rows, order].ravel(),
+    })
+
+
+def training_rows(histories, element_teams, matrix):
+    """Design matrix and targets from element-summary histories ({element: history list}).
+
+    Each (player, round) from round 2 onward is one row; features use only
+    the rounds before it, mirroring what form/ppg/minutes show at a deadline.
+    """
+    designs, targets = [], []
+    for element, history in histories.items():
+        if not history:
+            continue
+        rounds = pd.DataFrame(history).groupby('round')[['total_points', 'minutes']].sum()
+        last = int(rounds.index.max())
+        per_round = rounds.reindex(range(1, last + 1), fill_value=0)
+        points = per_round['total_points'].to_numpy(dtype=float)
+        minutes = per_round['minutes'].to_numpy(dtype=float)
+        played = (per_round['minutes'] > 0).to_numpy()
+        team = np.array([element_teams.get(element, 0)])
+        for target in range(2, last + 1):
+            prior = slice(0, target - 1)
+            recent = slice(max(0, target - 1 - RECENT_ROUNDS), target - 1)
+            fixtures, ease, home = fixture_features(matrix, team, target)
+            designs.append(_design(
+                np.array([points[recent].mean()]),
+                np.array([points[prior][played[prior]].mean() if played[prior].any() else 0.0]),
+                np.array([min(minutes[prior].sum() / (90 * (target - 1)), 1.0)]),
+                fixtures, ease, home,
+            ))
+            targets.append(points[target - 1])
+    if not designs:
+        return np.zeros((0, len(FEATURES))), np.zeros(0)
+    return np.vstack(designs), np.array(targets)
+
+
+def train(design, targets):
+    """Least-squares coefficients and in-sample RMSE"""
+    coefficients, *_ = np.linalg.lstsq(design, targets, rcond=None)
+    rmse = float(np.sqrt(np.mean((design @ coefficients - targets) ** 2))) if len(targets) else 0.0
+    return dict(zip(FEATURES, map(float, coefficients))), rmse
+
+
+def load_model(path=CAPTAIN_MODEL_PATH):
+    """Trained model dict (coefficients, trained_at, rows, rmse), or the defaults if none is saved"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'coefficients': DEFAULT_COEFFICIENTS, 'trained_at': None, 'rows': 0, 'rmse': None}
+
+
+def main():
+    from utils.fpl_api import FPLApiClient
+
+    parser = argparse.ArgumentParser(description="Train the captain expected-points model")
+    parser.add_argument('--players', type=int, default=300, help="Train on this many players with the most minutes")
+    parser.add_argument('--rate', type=float, default=BACKFILL_REQUESTS_PER_SECOND, help="Upstream requests per second")
+    args = parser.parse_args()
+
+    api = FPLApiClient()
+    bootstrap = api.get_bootstrap()
+    fixtures = api.get_fixtures()
+    if not bootstrap or not fixtures:
+        raise SystemExit("Bootstrap or fixtures unavailable")
+    matrix = FixtureMatrix(fixtures)
+    players = bootstrap.players.nlargest(args.players, 'minutes')
+    elements = [int(e) for e in players['id']]
+    bucket = TokenBucket(args.rate)
+    summaries = api.fetch_many((bucket.limit(api.get_element_summary), element) for element in elements)
+    histories = {e: s.get('history', []) for e, s in zip(elements, summaries) if s}
+    element_teams = dict(zip(elements, players['team'].astype(int)))
+
+    design, targets = training_rows(histories, element_teams, matrix)
+    coefficients, rmse = train(design, targets)
+    with open(CAPTAIN_MODEL_PATH, 'w') as f:
+        json.dump({'coefficients': coefficients, 'trained_at': time.time(), 'rows': len(targets), 'rmse': rmse}, f, indent=2)
+    print(f"Trained on {len(targets)} rows from {len(histories)} players, RMSE {rmse:.2f} -> {CAPTAIN_MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from utils.constants import TEAMS, CLUB_LEAGUES, CLUB_SQUAD_SIZE, CLUB_COUNTING_SCORES
+
+
+def club_members(api, club_leagues=CLUB_LEAGUES):
+    """DataFrame of club, entry, player_name for every club mini league, fetched concurrently.
+
+    Clubs whose standings could not be loaded are left out; new entries
+    (every member before the season) count as joined. A manager in
+    more than one club league counts for the first club only.
+    """
+    clubs = list(club_leagues)
+    standings = api.fetch_many((api.get_league_standings_df, club_leagues[club]) for club in clubs)
+    frames = [
+        df.loc[df['entry'].notna()].reindex(columns=['entry', 'player_name']).assign(club=club)
+        for club, df in zip(clubs, standings)
+        if df is not None and not df.empty
+    ]
+    if not frames:
+        return pd.DataFrame(columns=['club', 'entry', 'player_name'])
+    members = pd.concat(frames, ignore_index=True)
+    members['entry'] = members['entry'].astype(int)
+    return members.drop_duplicates('entry')[['club', 'entry', 'player_name']].reset_index(drop=True)
+
+
+def club_gameweek_scores(members, points, counting=CLUB_COUNTING_SCORES):
+    """Per (club, gameweek) score: the sum of the club's best `counting` net manager scores.
+
+    points has entry, gameweek and points columns (transfer hits already
+    deducted). Returns club, gameweek, points and managers (how many
+    members had a score that gameweek).
+    """
+    scored = points.merge(members[['club', 'entry']], on='entry')
+    if scored.empty:
+        return pd.DataFrame(columns=['club', 'gameweek', 'points', 'managers'])
+    scored = scored.sort_values(['club', 'gameweek', 'points'], ascending=[True, True, False])
+    # Sorted best first within each group, so the first `counting` rows are the ones that count
+    counts = scored.groupby(['club', 'gameweek']).cumcount().to_numpy() < counting
+    scored['counted'] = np.where(counts, scored['points'], 0)
+    return scored.groupby(['club', 'gameweek'], as_index=False).agg(
+        points=('counted', 'sum'),
+        managers=('entry', 'size'),
+    )
+
+
+def championship_table(scores, clubs=TEAMS):
+    """Championship standings from club gameweek scores.
+
+    Clubs are ranked on total points, then gameweek wins (highest club
+    score that gameweek, shared on ties). Registered clubs without scores
+    yet are listed with zeros.
+    """
+    if scores.empty:
+        table = pd.DataFrame({'club': list(clubs)})
+        table[['total', 'gameweek_wins', 'last_gameweek', 'best_gameweek']] = 0
+    else:
+        pivot = scores.pivot(index='club', columns='gameweek', values='points').reindex(list(clubs)).fillna(0)
+        values = pivot.to_numpy()
+        table = pd.DataFrame({
+            'club': pivot.index,
+            'total': values.sum(axis=1),
+            'gameweek_wins': (values == values.max(axis=0)).sum(axis=1) if len(pivot) > 1 else np.zeros(len(pivot), dtype=int),
+            'last_gameweek': values[:, -1],
+            'best_gameweek': values.max(axis=1),
+        })
+    table = table.sort_values(['total', 'gameweek_wins'], ascending=False, ignore_index=True)
+    table.insert(0, 'rank', np.arange(1, len(table) + 1))
+    return table
+
+
+def squad_status(members, clubs=TEAMS, squad_size=CLUB_SQUAD_SIZE):
+    """Joined managers per registered club against the squad size"""
+    joined = members.groupby('club')['entry'].size().reindex(list(clubs), fill_value=0)
+    return pd.DataFrame({'club': joined.index, 'joined': joined.to_numpy(), 'ready': joined.to_numpy() >= squad_size})
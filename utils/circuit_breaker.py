@@ -0,0 +1,44 @@
+import threading
+import time
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class CircuitBreaker:
+    """Stops calling an unhealthy upstream after repeated failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    `allow()` refuses calls for `reset_seconds`. It then lets a single probe
+    through (half-open): success closes the breaker, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go upstream now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                return True
+            # Open, or half-open with the probe already in flight
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
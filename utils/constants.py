@@ -1,27 +1,29 @@
-# Team mappings
-TEAMS = {
-    'NFO': 'Nottingham Forest',
-    'LIV': 'Liverpool', 
-    'MCI': 'Manchester City',
-    'ARS': 'Arsenal',
-    # Add all 20 teams...
-}
+import os
+from utils.registry import get_registry
 
-TEAM_COLORS = {
-    'NFO': '#DD0000',
-    'LIV': '#C8102E',
-    'MCI': '#6CABDD',
-    'ARS': '#EF0107',
-    # Add all team colors...
-}
+# League registry (config/leagues.toml), loaded once per process
+REGISTRY = get_registry()
+SEASON_NAME = REGISTRY.name
+HOME_CLUB = REGISTRY.home_club
 
-# QFPL League IDs - SEASON 2024/25
+# Team mappings
+TEAMS = {code: club.name for code, club in REGISTRY.clubs.items()}
+TEAM_COLORS = {code: club.color for code, club in REGISTRY.clubs.items()}
+
+# QFPL League IDs for the registry's season; NFO_MINI is the home club's mini league
 LEAGUE_IDS = {
-    'QFPL_MAIN': 65689,      # Main QFPL League
-    'NFO_MINI': 72659,       # NFO Mini League
-    # Other mini leagues will be added here
+    'QFPL_MAIN': REGISTRY.main_league,
+    'NFO_MINI': REGISTRY.club_leagues[HOME_CLUB],
 }
 
+# QFPL inter-team championship: club code -> that club's mini league
+CLUB_LEAGUES = REGISTRY.club_leagues
+CLUB_SQUAD_SIZE = REGISTRY.squad_size              # Managers per club
+CLUB_COUNTING_SCORES = REGISTRY.counting_scores    # Best manager scores per club that count each gameweek
+
+# Head-to-head leagues, scored live alongside the classic ones
+H2H_LEAGUE_IDS = REGISTRY.h2h_leagues
+
 # API endpoints
 FPL_BASE_URL = "https://fantasy.premierleague.com/api/"
 ENDPOINTS = {
@@ -31,5 +33,53 @@ ENDPOINTS = {
     'entry': 'entry/{team_id}/',
     'picks': 'entry/{team_id}/event/{event_id}/picks/',
     'league_h2h': 'leagues-h2h/{league_id}/standings/',
+    'league_h2h_matches': 'leagues-h2h-matches/league/{league_id}/',
     'transfers': 'entry/{team_id}/transfers/',
-}
\ No newline at end of file
+    'live': 'event/{event_id}/live/',
+    'element_summary': 'element-summary/{element_id}/',
+}
+
+# HTTP client settings
+REQUEST_TIMEOUT = 10         # Seconds per upstream request
+MAX_CONCURRENT_REQUESTS = 8  # Upper bound on in-flight requests per process
+RATE_LIMIT_PER_SECOND = 10   # Process-wide upstream request rate, shared by every session
+RATE_LIMIT_BURST = 20        # Requests allowed back to back before the rate applies
+RETRY_ATTEMPTS = 3           # Tries per request for connection errors and RETRYABLE_STATUSES
+RETRY_BACKOFF_SECONDS = 0.5  # Base of the exponential backoff between tries
+RETRY_BACKOFF_MAX = 8        # Longest single backoff (also caps Retry-After)
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+BREAKER_FAILURE_THRESHOLD = 5  # Failed requests in a row before upstream is treated as down
+BREAKER_RESET_SECONDS = 30     # How long to serve cached payloads before probing upstream again
+BACKFILL_REQUESTS_PER_SECOND = 5  # Sustained upstream rate for history backfills
+BACKFILL_BATCH_SIZE = 200         # (entry, gameweek) pairs fetched and committed per checkpoint
+
+
+# Local storage
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, 'http_cache')
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024  # LRU eviction beyond 200 MB
+HTTP_CACHE_FRESH_SECONDS = 60             # Serve from disk without revalidating when younger than this
+HISTORY_DB = os.path.join(DATA_DIR, 'history.sqlite')  # Append-only per-gameweek season history
+CAPTAIN_MODEL_PATH = os.path.join(DATA_DIR, 'captain_model.json')  # Coefficients written by `python -m utils.captain_model`
+
+# In-memory stale-while-revalidate policies per endpoint (seconds). Within `ttl`
+# an entry is fresh; for `grace` more it is served at once while a background
+# refresh runs; only a cold or older entry makes the caller wait for upstream.
+CACHE_POLICIES = {
+    'bootstrap': {'ttl': 300, 'grace': 3600},
+    'standings': {'ttl': 300, 'grace': 1800},
+    'picks': {'ttl': 60, 'grace': 3600},
+    'fixtures': {'ttl': 20, 'grace': 120},
+    'live': {'ttl': 20, 'grace': 60},
+    'element_summary': {'ttl': 3600, 'grace': 86400},
+    'h2h_standings': {'ttl': 300, 'grace': 1800},
+    'h2h_matches': {'ttl': 300, 'grace': 3600},  # Pairings are fixed; live scores come from the poller
+}
+RESPONSE_CACHE_MAX_ENTRIES = 5000  # LRU bound on cached responses (picks dominate)
+MIN_REFRESH_SECONDS = 30           # Shortest gap between two invalidations of the same scope (Refresh buttons)
+
+# Live polling
+LIVE_POLL_SECONDS = 30  # Default interval between live refreshes
+LIVE_POLL_JITTER = 5    # Up to this many seconds added so sessions don't poll in lockstep
+LIVE_IDLE_POLL_SECONDS = 600  # Background poller check-in when no match is in progress
+LIVE_PICKS_RETRY_SECONDS = 60  # First wait before re-requesting an entry's missing picks, doubled per miss
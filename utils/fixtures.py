@@ -0,0 +1,91 @@
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+
+SEASON_GAMEWEEKS = 38
+MAX_HORIZON = 8  # Longest "next N gameweeks" window precomputed
+MAX_DIFFICULTY = 5  # FDR scale is 1 (easiest) to 5; ease of a fixture is 6 - FDR
+
+
+def fixtures_revision(fixtures):
+    """Stable hash of the fields the difficulty matrix depends on, to key caches by"""
+    fields = sorted(
+        (f['id'], f.get('event'), f['team_h'], f['team_a'], f.get('team_h_difficulty'), f.get('team_a_difficulty'))
+        for f in fixtures or []
+    )
+    return hashlib.sha1(json.dumps(fields).encode('utf-8')).hexdigest()
+
+
+class FixtureMatrix:
+    """Teams x gameweeks fixture difficulty with rolling windows precomputed.
+
+    Each (team, gameweek) cell sums over that team's fixtures in the
+    gameweek, so a blank gameweek is 0 fixtures / 0 ease and a double
+    gameweek counts both games. Cumulative sums along gameweeks give every
+    window of 1..MAX_HORIZON gameweeks up front, and `window` / `ranking`
+    are then plain array slices.
+    """
+
+    STATS = ('fixtures', 'difficulty', 'ease')
+
+    def __init__(self, fixtures, n_gameweeks=SEASON_GAMEWEEKS):
+        # Unscheduled (postponed) fixtures have no event yet and are left out
+        scheduled = [f for f in fixtures or [] if f.get('event')]
+        self.n_gameweeks = max([n_gameweeks] + [f['event'] for f in scheduled])
+        self.rows = pd.DataFrame(
+            [(f['team_h'], f['event'], f['team_a'], True, f.get('team_h_difficulty') or 0) for f in scheduled]
+            + [(f['team_a'], f['event'], f['team_h'], False, f.get('team_a_difficulty') or 0) for f in scheduled],
+            columns=['team', 'event', 'opponent', 'home', 'difficulty'],
+        )
+        n_teams = int(self.rows['team'].max()) + 1 if len(self.rows) else 1
+
+        team = self.rows['team'].to_numpy()
+        event = self.rows['event'].to_numpy()
+        difficulty = self.rows['difficulty'].to_numpy()
+        # Column g holds gameweek g; column 0 stays empty so gameweeks index directly
+        self.cells = {stat: np.zeros((n_teams, self.n_gameweeks + 1), dtype=np.int32) for stat in self.STATS}
+        np.add.at(self.cells['fixtures'], (team, event), 1)
+        np.add.at(self.cells['difficulty'], (team, event), difficulty)
+        np.add.at(self.cells['ease'], (team, event), np.where(difficulty > 0, MAX_DIFFICULTY + 1 - difficulty, 0))
+
+        # windows[stat][h - 1, team, start - 1] = sum over gameweeks start .. start + h - 1 (clipped at season end)
+        self.windows = {}
+        for stat, cells in self.cells.items():
+            cumulative = np.cumsum(cells, axis=1)
+            padded = np.concatenate([cumulative, np.repeat(cumulative[:, -1:], MAX_HORIZON, axis=1)], axis=1)
+            self.windows[stat] = np.stack([
+                padded[:, h:h + self.n_gameweeks] - padded[:, :self.n_gameweeks]
+                for h in range(1, MAX_HORIZON + 1)
+            ])
+
+    def window(self, stat, start, horizon):
+        """Per-team sum of a stat over gameweeks start .. start + horizon - 1"""
+        return self.windows[stat][horizon - 1, :, start - 1]
+
+    def ranking(self, start, horizon, team_ids):
+        """Teams ranked by total fixture ease over the window (blanks count 0, doubles count twice)"""
+        team_ids = np.asarray(team_ids)
+        fixtures = self.window('fixtures', start, horizon)[team_ids]
+        difficulty = self.window('difficulty', start, horizon)[team_ids]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            average = np.where(fixtures > 0, difficulty / fixtures, np.nan)
+        ranking = pd.DataFrame({
+            'team': team_ids,
+            'fixtures': fixtures,
+            'average_difficulty': average,
+            'ease': self.window('ease', start, horizon)[team_ids],
+        })
+        return ranking.sort_values(['ease', 'average_difficulty'], ascending=[False, True], ignore_index=True)
+
+    def average_difficulty(self, start, horizon):
+        """(teams, horizon) average FDR per gameweek, NaN for blank gameweeks"""
+        end = min(start + horizon, self.n_gameweeks + 1)
+        fixtures = self.cells['fixtures'][:, start:end]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(fixtures > 0, self.cells['difficulty'][:, start:end] / fixtures, np.nan)
+
+    def opponents(self, start, horizon):
+        """Team id -> upcoming opponents in the window as (event, opponent id, home) rows in order"""
+        rows = self.rows[(self.rows['event'] >= start) & (self.rows['event'] < start + horizon)]
+        return {team: group.sort_values('event')[['event', 'opponent', 'home']] for team, group in rows.groupby('team')}
@@ -1,48 +1,397 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
 import pandas as pd
-from utils.constants import FPL_BASE_URL, ENDPOINTS, LEAGUE_IDS
-import streamlit as st
+from utils.constants import (
+    FPL_BASE_URL, ENDPOINTS, LEAGUE_IDS, REQUEST_TIMEOUT, MAX_CONCURRENT_REQUESTS, HTTP_CACHE_FRESH_SECONDS,
+    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, RETRY_ATTEMPTS, RETRY_BACKOFF_SECONDS, RETRY_BACKOFF_MAX,
+    RETRYABLE_STATUSES, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS, CACHE_POLICIES, RESPONSE_CACHE_MAX_ENTRIES,
+    MIN_REFRESH_SECONDS,
+)
+from utils.bootstrap import Bootstrap
+from utils.circuit_breaker import CircuitBreaker
+from utils.http_cache import DiskCache
+from utils.rate_limit import TokenBucket
+from utils.single_flight import SingleFlight
+from utils.swr_cache import SWRCache
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Module-level so every client (each page builds its own) and every session share one budget
+UPSTREAM_LIMITER = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+UPSTREAM_BREAKER = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+UPSTREAM_FLIGHTS = SingleFlight()
+UPSTREAM_IN_FLIGHT = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+RESPONSE_CACHE = SWRCache(RESPONSE_CACHE_MAX_ENTRIES)
+# One index over data/http_cache so the size bound and LRU order hold per directory, not per client
+DISK_CACHE = DiskCache()
+# What the parts of a cache key (after the policy name, before the URL) mean, for scoped invalidation
+CACHE_KEY_FIELDS = {
+    'bootstrap': (),
+    'standings': ('league_id', 'page_standings', 'page_new_entries'),
+    'picks': ('entry_id', 'gameweek'),
+    'fixtures': ('gameweek',),
+    'live': ('gameweek',),
+    'element_summary': ('element_id',),
+    'h2h_standings': ('league_id', 'page'),
+    'h2h_matches': ('league_id', 'gameweek', 'page'),
+}
+_last_invalidated = {}  # invalidation scope -> time it last went through
+_invalidation_lock = threading.Lock()
+# The indexed Bootstrap model and the payload it was built from, rebuilt only when the payload changes
+_bootstrap_model = {'source': None, 'model': None}
+_bootstrap_lock = threading.Lock()
+
+
+def _backoff(attempt, response=None):
+    """Seconds to wait before retry number `attempt` (0-based): Retry-After if given, else full jitter"""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(int(retry_after), RETRY_BACKOFF_MAX)
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_SECONDS * 2 ** attempt))
+
 
 class FPLApiClient:
-    def __init__(self):
+    def __init__(self, max_concurrency=MAX_CONCURRENT_REQUESTS, timeout=REQUEST_TIMEOUT, limiter=None, breaker=None):
         self.base_url = FPL_BASE_URL
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
         self.session = requests.Session()
-    
-    @st.cache_data(ttl=300)  # Cache for 5 minutes
+        # Size the connection pool to the concurrency limit so parallel fetches reuse sockets
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount('https://', adapter)
+        self._in_flight = UPSTREAM_IN_FLIGHT
+        # Responses persist under data/ so a restart is served from disk, not upstream
+        self.disk_cache = DISK_CACHE
+        self.limiter = limiter or UPSTREAM_LIMITER
+        self.breaker = breaker or UPSTREAM_BREAKER
+        self.flights = UPSTREAM_FLIGHTS
+        self.cache = RESPONSE_CACHE
+
+    def _url(_self, endpoint, **params):
+        """Build the full URL for an ENDPOINTS template"""
+        return f"{_self.base_url}{ENDPOINTS[endpoint].format(**params)}"
+
+    def _cached(_self, policy, key, url, fresh_for=HTTP_CACHE_FRESH_SECONDS):
+        """Serve a URL through the shared stale-while-revalidate cache under a CACHE_POLICIES entry"""
+        rules = CACHE_POLICIES[policy]
+        return _self.cache.get((policy, *key, url), lambda: _self._get_json(url, fresh_for=fresh_for),
+                               rules['ttl'], rules['grace'])
+
+    def invalidate(_self, policy=None, league_id=None, entry_id=None, gameweek=None):
+        """Drop cached responses matching every given scope and return how many were dropped.
+
+        e.g. invalidate('standings', league_id=...) or invalidate(gameweek=10)
+        for picks, fixtures and live data of that gameweek. Dropped responses
+        are also revalidated upstream on next use instead of served from disk.
+        A scope is honoured at most once per MIN_REFRESH_SECONDS, so repeated
+        Refresh clicks cannot force repeated refetches.
+        """
+        scope = (policy, league_id, entry_id, gameweek)
+        now = time.time()
+        with _invalidation_lock:
+            if now - _last_invalidated.get(scope, 0) < MIN_REFRESH_SECONDS:
+                return 0
+            _last_invalidated[scope] = now
+
+        wanted = {field: value for field, value in
+                  (('league_id', league_id), ('entry_id', entry_id), ('gameweek', gameweek)) if value is not None}
+
+        def match(key):
+            name, *values, _ = key
+            fields = dict(zip(CACHE_KEY_FIELDS[name], values))
+            return (policy is None or name == policy) and all(
+                field in fields and fields[field] == value for field, value in wanted.items()
+            )
+
+        dropped = _self.cache.invalidate(match)
+        for key in dropped:
+            _self.disk_cache.expire(key[-1])
+        return len(dropped)
+
+    def _get_json(_self, url, timeout=None, fresh_for=HTTP_CACHE_FRESH_SECONDS):
+        """GET a URL and decode the JSON body, None on error, timeout or non-200.
+
+        Responses are kept in the on-disk cache: entries younger than
+        `fresh_for` seconds are served without a request, older ones are revalidated with ETag/Last-Modified
+        so an unchanged payload costs a 304 instead of a full download.
+
+        Requests take a token from the shared rate limiter, and connection
+        errors and RETRYABLE_STATUSES are retried with exponential backoff.
+        When retries run out, or the circuit breaker is open, the last good
+        cached payload is served instead (None if there is none).
+
+        Concurrent calls for the same URL share one upstream request, so a
+        cache expiry seen by many sessions at once costs a single fetch.
+        """
+        cached = _self.disk_cache.get(url)
+        if cached and time.time() - cached['fetched_at'] < fresh_for:
+            return json.loads(cached['body'])
+        return _self.flights.do(url, lambda: _self._request_json(url, cached, timeout))
+
+    def _request_json(_self, url, cached, timeout=None):
+        """Revalidate or fetch a URL upstream (see _get_json)"""
+        stale = json.loads(cached['body']) if cached else None
+        if not _self.breaker.allow():
+            return stale
+
+        headers = _self.disk_cache.conditional_headers(cached) if cached else {}
+        for attempt in range(RETRY_ATTEMPTS):
+            _self.limiter.acquire()
+            with _self._in_flight:
+                try:
+                    response = _self.session.get(url, headers=headers, timeout=timeout or _self.timeout)
+                except requests.RequestException:
+                    response = None
+            if response is not None and response.status_code not in RETRYABLE_STATUSES:
+                break
+            if attempt + 1 < RETRY_ATTEMPTS:
+                time.sleep(_backoff(attempt, response))
+        else:
+            _self.breaker.record_failure()
+            return stale
+        _self.breaker.record_success()
+
+        if response.status_code == 304 and cached:
+            _self.disk_cache.touch(url)
+            return json.loads(cached['body'])
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        _self.disk_cache.set(url, response.content, response.headers)
+        return data
+
+    def fetch_many(_self, calls, timeout=None):
+        """Run (method, *args) calls concurrently and return results in call order.
+
+        In-flight HTTP requests are capped process-wide by
+        MAX_CONCURRENT_REQUESTS; a call that raises or has not finished
+        within `timeout` seconds of the batch start yields None.
+        """
+        calls = list(calls)
+        if not calls:
+            return []
+        ctx = get_script_run_ctx()
+
+        def run(call):
+            # Worker threads carry the script context so Streamlit calls inside them work
+            add_script_run_ctx(threading.current_thread(), ctx)
+            func, *args = call
+            return func(*args)
+
+        pool = ThreadPoolExecutor(max_workers=min(len(calls), _self.max_concurrency), thread_name_prefix='fpl-fetch')
+        try:
+            futures = [pool.submit(run, call) for call in calls]
+            done, _ = wait(futures, timeout=timeout)
+        finally:
+            # Don't block on calls that overran the timeout; ones not started yet are dropped
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result() if future in done else None)
+            except Exception:
+                results.append(None)
+        return results
+
     def get_bootstrap_data(_self):
         """Get main FPL data (players, teams, gameweeks)"""
-        url = f"{_self.base_url}{ENDPOINTS['bootstrap']}"
-        response = _self.session.get(url)
-        return response.json() if response.status_code == 200 else None
-    
-    @st.cache_data(ttl=300)
-    def get_league_standings(_self, league_id):
-        """Get league standings"""
-        url = f"{_self.base_url}{ENDPOINTS['league'].format(league_id=league_id)}"
-        response = _self.session.get(url)
-        return response.json() if response.status_code == 200 else None
-    
-    @st.cache_data(ttl=60)  # Cache for 1 minute for live data
+        return _self._cached('bootstrap', (), _self._url('bootstrap'))
+
+    def get_league_standings(_self, league_id, page_standings=1, page_new_entries=1):
+        """Get one page of league standings (50 standings / 50 new entries per page)"""
+        url = _self._url('league', league_id=league_id)
+        return _self._cached('standings', (league_id, page_standings, page_new_entries),
+                             f"{url}?page_standings={page_standings}&page_new_entries={page_new_entries}")
+
+    def iter_league_standings(_self, league_id, entry_ids=None):
+        """Yield every page of a classic league's standings and new entries.
+
+        The next page is requested in the background while the caller handles
+        the current one. If `entry_ids` is given, iteration stops as soon as
+        all of those entries have been seen.
+        """
+        remaining = set(entry_ids) if entry_ids is not None else None
+        page_standings = page_new_entries = 1
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='fpl-page') as pool:
+            ctx = get_script_run_ctx()
+
+            def fetch(*pages):
+                add_script_run_ctx(threading.current_thread(), ctx)
+                return _self.get_league_standings(league_id, *pages)
+
+            # First page without page args so it shares a cache entry with single-page callers
+            pending = pool.submit(fetch)
+            while pending is not None:
+                page = pending.result()
+                if not page:
+                    return
+                standings = page.get('standings', {})
+                new_entries = page.get('new_entries', {})
+                if standings.get('has_next') or new_entries.get('has_next'):
+                    # Advance only the sections that have more pages
+                    page_standings += bool(standings.get('has_next'))
+                    page_new_entries += bool(new_entries.get('has_next'))
+                    pending = pool.submit(fetch, page_standings, page_new_entries)
+                else:
+                    pending = None
+
+                if remaining is not None:
+                    for row in standings.get('results', []) + new_entries.get('results', []):
+                        remaining.discard(row['entry'])
+                yield page
+                if remaining is not None and not remaining:
+                    if pending is not None:
+                        pending.cancel()
+                    return
+
+    def get_league_standings_df(_self, league_id, entry_ids=None):
+        """Collect all standings pages into one DataFrame.
+
+        Rows carry a `section` column ('standings' or 'new_entries') and a
+        `player_name` for both; with `entry_ids` the fetch stops early and
+        only those entries are returned.
+        """
+        frames = []
+        seen_standings = set()
+        seen_new_entries = set()
+        for page in _self.iter_league_standings(league_id, entry_ids):
+            # Only advance-able sections move between requests, so skip repeated pages
+            for section, seen in (('standings', seen_standings), ('new_entries', seen_new_entries)):
+                block = page.get(section, {})
+                if block.get('page') in seen or not block.get('results'):
+                    continue
+                seen.add(block.get('page'))
+                frames.append(pd.DataFrame(block['results']).assign(section=section))
+        if not frames:
+            return pd.DataFrame(columns=['entry', 'section'])
+        df = pd.concat(frames, ignore_index=True)
+        if 'player_first_name' in df:
+            # New entries carry first/last name instead of player_name
+            full_names = df['player_first_name'] + ' ' + df['player_last_name']
+            df['player_name'] = df.get('player_name', full_names).fillna(full_names)
+        if entry_ids is not None:
+            df = df[df['entry'].isin(list(entry_ids))].reset_index(drop=True)
+        return df
+
+    def get_h2h_standings(_self, league_id, page=1):
+        """Get one page of H2H league standings (league points, points for, W/D/L)"""
+        url = _self._url('league_h2h', league_id=league_id)
+        return _self._cached('h2h_standings', (league_id, page), f"{url}?page_standings={page}")
+
+    def get_h2h_matches(_self, league_id, gameweek, page=1):
+        """Get one page of an H2H league's matches for a gameweek"""
+        url = _self._url('league_h2h_matches', league_id=league_id)
+        return _self._cached('h2h_matches', (league_id, gameweek, page), f"{url}?event={gameweek}&page={page}")
+
+    def iter_pages(_self, fetch, section=None):
+        """Yield pages from fetch(page) while they report has_next, fetching the next one in the background.
+
+        `section` names the key holding has_next/results when they are nested
+        (H2H standings use 'standings'; H2H matches are top level).
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='fpl-page') as pool:
+            ctx = get_script_run_ctx()
+
+            def run(page):
+                add_script_run_ctx(threading.current_thread(), ctx)
+                return fetch(page)
+
+            number = 1
+            pending = pool.submit(run, number)
+            while pending is not None:
+                page = pending.result()
+                if not page:
+                    return
+                block = page.get(section, {}) if section else page
+                pending = None
+                if block.get('has_next'):
+                    number += 1
+                    pending = pool.submit(run, number)
+                yield block
+
+    def get_h2h_standings_df(_self, league_id):
+        """All H2H standings pages as one DataFrame"""
+        frames = [pd.DataFrame(block['results'])
+                  for block in _self.iter_pages(lambda page: _self.get_h2h_standings(league_id, page), 'standings')
+                  if block.get('results')]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['entry', 'total'])
+
+    def get_h2h_matches_df(_self, league_id, gameweek):
+        """All of an H2H league's matches for a gameweek as one DataFrame"""
+        frames = [pd.DataFrame(block['results'])
+                  for block in _self.iter_pages(lambda page: _self.get_h2h_matches(league_id, gameweek, page))
+                  if block.get('results')]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['entry_1_entry', 'entry_2_entry'])
+
     def get_team_picks(_self, team_id, gameweek):
         """Get team's picks for a specific gameweek"""
-        url = f"{_self.base_url}{ENDPOINTS['picks'].format(team_id=team_id, event_id=gameweek)}"
-        response = _self.session.get(url)
-        return response.json() if response.status_code == 200 else None
-    
+        return _self._cached('picks', (team_id, gameweek), _self._url('picks', team_id=team_id, event_id=gameweek))
+
+    def get_entry(_self, team_id):
+        """Get a team's summary (name, manager, started_event)"""
+        return _self._get_json(_self._url('entry', team_id=team_id))
+
+    def get_entry_transfers(_self, team_id):
+        """Get every transfer a team has made this season"""
+        return _self._get_json(_self._url('transfers', team_id=team_id))
+
+    def get_fixtures(_self, event_id=None):
+        """Get fixtures, optionally only those of one gameweek"""
+        url = _self._url('fixtures')
+        return _self._cached('fixtures', (event_id,), f"{url}?event={event_id}" if event_id else url, fresh_for=0)
+
+    def get_event_live(_self, event_id):
+        """Get live per-player stats for a gameweek"""
+        return _self._cached('live', (event_id,), _self._url('live', event_id=event_id), fresh_for=0)
+
+    def get_element_summary(_self, element_id):
+        """Get a player's fixtures and per-gameweek history this season"""
+        return _self._cached('element_summary', (element_id,), _self._url('element_summary', element_id=element_id))
+
+    def fetch_event_live(_self, event_id):
+        """Get live per-player stats for a gameweek (uncached - sessions read it via the live poller)"""
+        return _self._get_json(_self._url('live', event_id=event_id), fresh_for=0)
+
+    def fetch_league_standings(_self, league_id):
+        """Get the first standings page bypassing the in-memory cache"""
+        return _self._get_json(_self._url('league', league_id=league_id), fresh_for=0)
+
+    def fetch_fixtures(_self, event_id=None):
+        """Get fixtures bypassing the in-memory cache, always revalidated upstream"""
+        url = _self._url('fixtures')
+        return _self._get_json(f"{url}?event={event_id}" if event_id else url, fresh_for=0)
+
+    def get_picks_for_entries(_self, team_ids, gameweek):
+        """Get picks for many teams concurrently, keyed by team id"""
+        team_ids = list(team_ids)
+        results = _self.fetch_many((_self.get_team_picks, team_id, gameweek) for team_id in team_ids)
+        return dict(zip(team_ids, results))
+
     def get_nfo_mini_league(_self):
         """Get NFO Mini League standings"""
         return _self.get_league_standings(LEAGUE_IDS['NFO_MINI'])
-    
+
     def get_qfpl_main_league(_self):
         """Get Main QFPL League standings"""
         return _self.get_league_standings(LEAGUE_IDS['QFPL_MAIN'])
-    
+
+    def get_bootstrap(_self):
+        """Get the indexed Bootstrap model, built once per bootstrap payload and shared by all sessions"""
+        data = _self.get_bootstrap_data()
+        if not data:
+            return None
+        with _bootstrap_lock:
+            if _bootstrap_model['source'] is not data:
+                _bootstrap_model.update(source=data, model=Bootstrap(data))
+            return _bootstrap_model['model']
+
     def get_current_gameweek(_self):
         """Get current gameweek number"""
-        data = _self.get_bootstrap_data()
-        if data:
-            events = data['events']
-            for event in events:
-                if event['is_current']:
-                    return event['id']
-        return 1
\ No newline at end of file
+        bootstrap = _self.get_bootstrap()
+        if bootstrap and bootstrap.current_event:
+            return bootstrap.current_event
+        return 1
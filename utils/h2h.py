@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+
+def score_lookup(entries, scores, wanted, fallback):
+    """Scores for `wanted` entry ids from an (entries, scores) pair, `fallback` where an entry is missing.
+
+    One sort plus searchsorted, so every matchup reads the same live vector.
+    """
+    entries = np.asarray(entries, dtype=np.int64)
+    wanted = np.asarray(wanted, dtype=np.int64)
+    fallback = np.asarray(fallback, dtype=float)
+    if len(entries) == 0:
+        return fallback
+    order = np.argsort(entries)
+    sorted_entries = entries[order]
+    position = np.minimum(np.searchsorted(sorted_entries, wanted), len(sorted_entries) - 1)
+    found = sorted_entries[position] == wanted
+    return np.where(found, np.asarray(scores, dtype=float)[order][position], fallback)
+
+
+def resolve_matches(matches, entries=(), scores=()):
+    """Results for one gameweek's H2H matches, scored from a live (entries, scores) pair.
+
+    matches is the get_h2h_matches_df frame. Entries without a live score
+    keep the points FPL reports for the match. A bye (no entry_2) is
+    played against the average score of the gameweek's matches, as in FPL.
+    Returns entry_1, entry_2, score_1, score_2 and result (1 entry_1
+    wins, 0 draw, -1 entry_2 wins).
+    """
+    entry_1 = matches['entry_1_entry'].fillna(0).to_numpy(dtype=np.int64)
+    entry_2 = matches['entry_2_entry'].fillna(0).to_numpy(dtype=np.int64)
+    score_1 = score_lookup(entries, scores, entry_1, matches['entry_1_points'].fillna(0))
+    score_2 = score_lookup(entries, scores, entry_2, matches['entry_2_points'].fillna(0))
+    bye = entry_2 == 0
+    if bye.any():
+        played = np.concatenate([score_1, score_2[~bye]])
+        score_2 = np.where(bye, np.floor(played.mean()), score_2)
+    return pd.DataFrame({
+        'entry_1': entry_1,
+        'entry_2': entry_2,
+        'score_1': score_1,
+        'score_2': score_2,
+        'result': np.sign(score_1 - score_2).astype(int),
+    })
+
+
+def project_table(standings, resolved):
+    """H2H table with a gameweek's resolved matches added on top of the standings.
+
+    standings is the get_h2h_standings_df frame (total is league points).
+    Returns it with projected total, points_for, W/D/L, rank and movement.
+    """
+    # Both sides of every match as one (entry, score, result) column set; byes have no second side
+    real = resolved['entry_2'].to_numpy() != 0
+    sides = pd.DataFrame({
+        'entry': np.concatenate([resolved['entry_1'], resolved['entry_2'][real]]),
+        'score': np.concatenate([resolved['score_1'], resolved['score_2'][real]]),
+        'result': np.concatenate([resolved['result'], -resolved['result'][real]]),
+    }).drop_duplicates('entry').set_index('entry')
+
+    table = standings.copy()
+    side = sides.reindex(table['entry'])
+    result = side['result'].to_numpy()
+    table['gameweek_points'] = side['score'].fillna(0).to_numpy()
+    table['match_points'] = np.select([result == 1, result == 0], [WIN_POINTS, DRAW_POINTS], 0)
+    table['total'] = table['total'] + table['match_points']
+    table['points_for'] = table['points_for'] + table['gameweek_points']
+    for column, outcome in (('matches_won', 1), ('matches_drawn', 0), ('matches_lost', -1)):
+        table[column] = table[column] + (result == outcome)
+    table = table.sort_values(['total', 'points_for'], ascending=False, ignore_index=True)
+    table['projected_rank'] = np.arange(1, len(table) + 1)
+    table['movement'] = table['rank'] - table['projected_rank']
+    return table
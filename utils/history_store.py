@@ -0,0 +1,231 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+import pandas as pd
+import streamlit as st
+from utils.constants import HISTORY_DB
+
+# One table per dataset; every row carries the gameweek it was captured for,
+# and (gameweek, ...) primary keys make each gameweek an append-only partition
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS gameweeks (
+    gameweek INTEGER PRIMARY KEY,
+    deadline_time TEXT,
+    average_entry_score INTEGER,
+    highest_score INTEGER,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    gameweek INTEGER NOT NULL,
+    element INTEGER NOT NULL,
+    web_name TEXT,
+    team INTEGER,
+    element_type INTEGER,
+    now_cost INTEGER,
+    selected_by_percent REAL,
+    total_points INTEGER,
+    PRIMARY KEY (gameweek, element)
+);
+CREATE TABLE IF NOT EXISTS standings (
+    gameweek INTEGER NOT NULL,
+    league_id INTEGER NOT NULL,
+    entry INTEGER NOT NULL,
+    entry_name TEXT,
+    player_name TEXT,
+    rank INTEGER,
+    total INTEGER,
+    PRIMARY KEY (gameweek, league_id, entry)
+);
+CREATE TABLE IF NOT EXISTS entry_history (
+    gameweek INTEGER NOT NULL,
+    entry INTEGER NOT NULL,
+    points INTEGER,
+    total_points INTEGER,
+    overall_rank INTEGER,
+    bank INTEGER,
+    value INTEGER,
+    event_transfers INTEGER,
+    event_transfers_cost INTEGER,
+    points_on_bench INTEGER,
+    active_chip TEXT,
+    PRIMARY KEY (gameweek, entry)
+);
+CREATE TABLE IF NOT EXISTS picks (
+    gameweek INTEGER NOT NULL,
+    entry INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    element INTEGER NOT NULL,
+    multiplier INTEGER,
+    is_captain INTEGER,
+    is_vice_captain INTEGER,
+    PRIMARY KEY (gameweek, entry, position)
+);
+CREATE TABLE IF NOT EXISTS transfers (
+    gameweek INTEGER NOT NULL,
+    entry INTEGER NOT NULL,
+    time TEXT NOT NULL,
+    element_in INTEGER NOT NULL,
+    element_in_cost INTEGER,
+    element_out INTEGER,
+    element_out_cost INTEGER,
+    PRIMARY KEY (gameweek, entry, time, element_in)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    entry INTEGER PRIMARY KEY,
+    started_event INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS picks_by_element ON picks (gameweek, element);
+CREATE INDEX IF NOT EXISTS entry_history_by_entry ON entry_history (entry, gameweek);
+"""
+
+PLAYER_FIELDS = ['web_name', 'team', 'element_type', 'now_cost', 'selected_by_percent', 'total_points']
+HISTORY_FIELDS = ['points', 'total_points', 'overall_rank', 'bank', 'value', 'event_transfers',
+                  'event_transfers_cost', 'points_on_bench']
+TRANSFER_FIELDS = ['time', 'element_in', 'element_in_cost', 'element_out', 'element_out_cost']
+
+
+class HistoryStore:
+    """Local SQLite warehouse of per-gameweek snapshots.
+
+    Rows are only ever inserted (INSERT OR IGNORE on the partition keys), so
+    re-ingesting a gameweek is a no-op and history written after a gameweek
+    is never rewritten. Trend queries are single scans over these tables.
+    """
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # A connection per call keeps the store safe to use from any thread
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _insert(self, conn, table, rows):
+        rows = list(rows)
+        if rows:
+            columns = ', '.join(rows[0])
+            marks = ', '.join('?' * len(rows[0]))
+            conn.executemany(f'INSERT OR IGNORE INTO {table} ({columns}) VALUES ({marks})', [tuple(r.values()) for r in rows])
+        return len(rows)
+
+    def ingested_gameweeks(self):
+        """Sorted list of gameweeks already sealed in the store"""
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute('SELECT gameweek FROM gameweeks ORDER BY gameweek')]
+
+    def has_picks(self, gameweek, entries):
+        """Subset of entries whose picks for the gameweek are already stored"""
+        with closing(self._connect()) as conn:
+            stored = {row[0] for row in conn.execute('SELECT DISTINCT entry FROM picks WHERE gameweek = ?', (gameweek,))}
+        return [entry for entry in entries if entry in stored]
+
+    def stored_pairs(self, entries):
+        """Set of (entry, gameweek) pairs whose picks are already stored"""
+        entries = [int(entry) for entry in entries]
+        with closing(self._connect()) as conn:
+            rows = conn.execute('SELECT entry, gameweek FROM entry_history')
+            wanted = set(entries)
+            return {(entry, gameweek) for entry, gameweek in rows if entry in wanted}
+
+    def entry_starts(self, entries):
+        """Entry -> first gameweek it played, for entries already recorded"""
+        wanted = {int(entry) for entry in entries}
+        with closing(self._connect()) as conn:
+            return {entry: start for entry, start in conn.execute('SELECT entry, started_event FROM entries') if entry in wanted}
+
+    def write_entry_starts(self, starts):
+        """Record entry -> started_event"""
+        with closing(self._connect()) as conn, conn:
+            self._insert(conn, 'entries', ({'entry': int(e), 'started_event': int(s)} for e, s in starts.items()))
+
+    def write_gameweek(self, gameweek, event=None, players=None, standings=None, picks=None, transfers=None, seal=True):
+        """Append one gameweek's snapshot in a single transaction.
+
+        event: the bootstrap event row; players: bootstrap players DataFrame;
+        standings: {league_id: standings DataFrame}; picks: {entry: picks payload};
+        transfers: {entry: transfers list} (only this gameweek's moves are kept).
+        With seal=False the gameweek stays open so missing entries can be added later.
+        """
+        with closing(self._connect()) as conn, conn:
+            if players is not None:
+                self._insert(conn, 'players', (
+                    {'gameweek': gameweek, 'element': int(row['id']),
+                     **{field: _value(row[field]) for field in PLAYER_FIELDS}}
+                    for _, row in players.iterrows()
+                ))
+            for league_id, df in (standings or {}).items():
+                self._insert(conn, 'standings', (
+                    {'gameweek': gameweek, 'league_id': league_id, 'entry': int(row['entry']),
+                     'entry_name': _value(row.get('entry_name')), 'player_name': _value(row.get('player_name')),
+                     'rank': _value(row.get('rank')), 'total': _value(row.get('total'))}
+                    for _, row in df.iterrows() if pd.notna(row.get('entry'))
+                ))
+            for entry, data in (picks or {}).items():
+                if not data:
+                    continue
+                history = data.get('entry_history') or {}
+                self._insert(conn, 'entry_history', [{
+                    'gameweek': gameweek, 'entry': entry,
+                    **{field: history.get(field) for field in HISTORY_FIELDS},
+                    'active_chip': data.get('active_chip'),
+                }])
+                self._insert(conn, 'picks', (
+                    {'gameweek': gameweek, 'entry': entry, 'position': pick['position'], 'element': pick['element'],
+                     'multiplier': pick.get('multiplier'), 'is_captain': int(pick.get('is_captain', False)),
+                     'is_vice_captain': int(pick.get('is_vice_captain', False))}
+                    for pick in data.get('picks', [])
+                ))
+            for entry, moves in (transfers or {}).items():
+                self._insert(conn, 'transfers', (
+                    {'gameweek': gameweek, 'entry': entry, **{field: move.get(field) for field in TRANSFER_FIELDS}}
+                    for move in moves or [] if move.get('event') == gameweek
+                ))
+            if seal:
+                self._seal(conn, gameweek, event)
+
+    def seal_gameweek(self, gameweek, event=None):
+        """Mark a gameweek complete so ingestion skips it"""
+        with closing(self._connect()) as conn, conn:
+            self._seal(conn, gameweek, event)
+
+    def _seal(self, conn, gameweek, event):
+        conn.execute(
+            'INSERT OR IGNORE INTO gameweeks VALUES (?, ?, ?, ?, ?)',
+            (gameweek, _value(event.get('deadline_time')) if event is not None else None,
+             _value(event.get('average_entry_score')) if event is not None else None,
+             _value(event.get('highest_score')) if event is not None else None, time.time()),
+        )
+
+    def query(self, sql, params=()):
+        """Run a read query and return a DataFrame"""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def entry_points(self, entries=None):
+        """Per-gameweek points, totals and overall rank for entries (all when None)"""
+        sql = 'SELECT gameweek, entry, points, total_points, overall_rank, event_transfers_cost, active_chip FROM entry_history'
+        if entries is None:
+            return self.query(sql + ' ORDER BY gameweek, entry')
+        entries = [int(entry) for entry in entries]
+        return self.query(f"{sql} WHERE entry IN ({', '.join('?' * len(entries))}) ORDER BY gameweek, entry", entries)
+
+    def gameweek_averages(self):
+        """Global average and highest score of every sealed gameweek"""
+        return self.query('SELECT gameweek, average_entry_score, highest_score FROM gameweeks ORDER BY gameweek')
+
+
+def _value(value):
+    """Plain Python value for sqlite (numpy scalars and NA become int/float/None)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+@st.cache_resource
+def get_history_store():
+    """Open the season history store once per process"""
+    return HistoryStore()
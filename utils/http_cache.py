@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from utils.constants import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES
+
+
+class DiskCache:
+    """Size-bounded on-disk store of HTTP responses keyed by URL.
+
+    Each entry is a raw body file plus a small JSON metadata file holding the
+    URL, the validator headers (ETag / Last-Modified) and the fetch time.
+    Least recently used entries are evicted once the store exceeds `max_bytes`.
+    """
+
+    VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes = OrderedDict()  # key -> bytes on disk, oldest access first
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _key(self, url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return f"{base}.body", f"{base}.meta.json"
+
+    def _load_index(self):
+        """Rebuild the LRU order from file modification times after a restart"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.meta.json'):
+                continue
+            key = name[:-len('.meta.json')]
+            body_path, meta_path = self._paths(key)
+            try:
+                size = os.path.getsize(body_path) + os.path.getsize(meta_path)
+                entries.append((os.path.getmtime(meta_path), key, size))
+            except OSError:
+                continue
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+
+    def get(self, url):
+        """Return {'url', 'body', 'headers', 'fetched_at'} for a URL, or None"""
+        key = self._key(url)
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['body'] = f.read()
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if key in self._sizes:
+                self._sizes.move_to_end(key)
+        return entry
+
+    def set(self, url, body, headers):
+        """Store a response body with its validator headers"""
+        key = self._key(url)
+        body_path, meta_path = self._paths(key)
+        meta = {
+            'url': url,
+            'headers': {name: headers[name] for name in self.VALIDATOR_HEADERS if name in headers},
+            'fetched_at': time.time(),
+        }
+        self._write(body_path, body)
+        self._write(meta_path, json.dumps(meta).encode('utf-8'))
+        with self._lock:
+            self._sizes[key] = len(body) + os.path.getsize(meta_path)
+            self._sizes.move_to_end(key)
+            self._evict()
+
+    def touch(self, url, fetched_at=None):
+        """Mark a cached entry as revalidated (e.g. after a 304) without rewriting the body"""
+        entry = self.get(url)
+        if entry is None:
+            return
+        meta = {'url': entry['url'], 'headers': entry['headers'], 'fetched_at': time.time() if fetched_at is None else fetched_at}
+        self._write(self._paths(self._key(url))[1], json.dumps(meta).encode('utf-8'))
+
+    def expire(self, url):
+        """Force the next read to revalidate upstream, keeping body and validators for a 304"""
+        self.touch(url, fetched_at=0)
+
+    def conditional_headers(self, entry):
+        """Request headers that let upstream answer 304 for an unchanged payload"""
+        headers = {}
+        if 'ETag' in entry['headers']:
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if 'Last-Modified' in entry['headers']:
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    def _write(self, path, data):
+        # Write-then-rename so readers never see a partial file
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        total = sum(self._sizes.values())
+        while total > self.max_bytes and len(self._sizes) > 1:
+            key, size = self._sizes.popitem(last=False)
+            total -= size
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,67 @@
+from utils.constants import LEAGUE_IDS, CLUB_LEAGUES
+
+# Club mini leagues are tracked too so the championship has every member's history
+TRACKED_LEAGUES = tuple(dict.fromkeys((LEAGUE_IDS['NFO_MINI'], LEAGUE_IDS['QFPL_MAIN'], *CLUB_LEAGUES.values())))
+
+
+def last_finished_gameweek(bootstrap):
+    """Latest gameweek whose points are final (finished and data checked), or None"""
+    done = bootstrap.events.loc[bootstrap.events['finished'] & bootstrap.events['data_checked'], 'id']
+    return int(done.max()) if len(done) else None
+
+
+def tracked_entries(api, league_ids=TRACKED_LEAGUES):
+    """League id -> current standings DataFrame, and the de-duplicated entry ids across them"""
+    standings = {league_id: api.get_league_standings_df(league_id) for league_id in league_ids}
+    entries = list(dict.fromkeys(int(e) for df in standings.values() if 'entry' in df for e in df['entry'].dropna()))
+    return standings, entries
+
+
+def entry_starts(api, store, entries, get_entry=None):
+    """Entry -> started_event, fetching entry summaries only for entries not recorded yet.
+
+    Entries whose summary could not be fetched map to 1, i.e. they are
+    treated as having played every gameweek, and are looked up again on
+    the next call. get_entry defaults to api.get_entry (pass a rate
+    limited one for bulk runs).
+    """
+    get_entry = get_entry or api.get_entry
+    starts = store.entry_starts(entries)
+    unknown = [entry for entry in entries if entry not in starts]
+    summaries = api.fetch_many((get_entry, entry) for entry in unknown)
+    found = {entry: summary.get('started_event') or 1 for entry, summary in zip(unknown, summaries) if summary}
+    store.write_entry_starts(found)
+    return {**dict.fromkeys(entries, 1), **starts, **found}
+
+
+def ingest_gameweek(api, store, gameweek, league_ids=TRACKED_LEAGUES, snapshot_current=True):
+    """Snapshot one gameweek for every tracked entry into the history store.
+
+    Picks (with their entry_history) and that gameweek's transfers are
+    fetched for entries not stored yet. Bootstrap players and league
+    standings only describe "now", so they are written only with
+    snapshot_current, i.e. right after the gameweek finished. The gameweek
+    is sealed once every entry's picks are in, not counting entries that
+    joined after it (their started_event is later). Returns the number of
+    entries written.
+    """
+    bootstrap = api.get_bootstrap()
+    standings, entries = tracked_entries(api, league_ids)
+    stored = set(store.has_picks(gameweek, entries))
+    missing = [entry for entry in entries if entry not in stored]
+
+    picks = dict(zip(missing, api.fetch_many((api.get_team_picks, entry, gameweek) for entry in missing)))
+    transfers = dict(zip(missing, api.fetch_many((api.get_entry_transfers, entry) for entry in missing)))
+    # Entries that joined after this gameweek have no picks for it, and never will
+    absent = [entry for entry, data in picks.items() if not data]
+    complete = all(start > gameweek for start in entry_starts(api, store, absent).values())
+    store.write_gameweek(
+        gameweek,
+        event=bootstrap.event(gameweek) if bootstrap else None,
+        players=bootstrap.players if bootstrap and snapshot_current else None,
+        standings=standings if snapshot_current else None,
+        picks=picks,
+        transfers=transfers,
+        seal=complete,
+    )
+    return sum(1 for data in picks.values() if data)
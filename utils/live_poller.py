@@ -0,0 +1,241 @@
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+import streamlit as st
+from utils.constants import (
+    LEAGUE_IDS, LIVE_POLL_SECONDS, LIVE_POLL_JITTER, LIVE_IDLE_POLL_SECONDS, LIVE_PICKS_RETRY_SECONDS,
+    MIN_REFRESH_SECONDS, CACHE_POLICIES,
+)
+from utils.live_schedule import next_poll_delay
+import numpy as np
+import pandas as pd
+from utils.live_ranker import IncrementalRanker
+from utils.live_scoring import build_picks_matrix, live_stat_vector, did_not_play_vector, projected_multipliers, pick_multipliers, subset
+from utils.history_store import HistoryStore
+from utils.ingest import TRACKED_LEAGUES, last_finished_gameweek, ingest_gameweek
+
+# One immutable view of the live gameweek, shared by every session
+LiveSnapshot = namedtuple('LiveSnapshot', [
+    'gameweek',     # Current event id
+    'fixtures',     # Tuple of the gameweek's fixture dicts
+    'live',         # Tuple of event-live element dicts (id, stats, explain)
+    'standings',    # league id -> first standings page
+    'picks',        # entry id -> picks payload for the gameweek
+    'picks_matrix', # PicksMatrix over every entry in `picks`
+    'points',       # Live points vector indexed by element id
+    'minutes',      # Live minutes vector indexed by element id
+    'multipliers',  # (M, 15) multipliers after projected auto-subs and vice-captaincy
+    'members',      # league id -> DataFrame of entry, entry_name, player_name
+    'live_ranks',   # league id -> DataFrame of entry, total, rank, movement since the previous poll
+    'fetched_at',   # Unix time of the poll that produced this snapshot
+    'next_poll_at', # Unix time the poller will next go upstream
+])
+
+
+class LivePoller:
+    """Process-wide background worker that polls live endpoints and publishes snapshots.
+
+    Sessions only ever read `snapshot`, so upstream traffic is one poll per
+    interval no matter how many viewers are connected. Picks are fetched once
+    per gameweek for every entry of the tracked leagues; entries whose picks
+    are missing (e.g. joined after the deadline) are retried with backoff.
+    League members are reloaded on the standings cache TTL so new joiners
+    appear between gameweeks. Once a gameweek's points are final it is
+    written to the season history store for every tracked league, club
+    mini leagues included.
+    """
+
+    def __init__(self, api, league_ids=(LEAGUE_IDS['NFO_MINI'], LEAGUE_IDS['QFPL_MAIN']), interval=LIVE_POLL_SECONDS,
+                 jitter=LIVE_POLL_JITTER, idle_interval=LIVE_IDLE_POLL_SECONDS, history=None):
+        self.api = api
+        self.league_ids = tuple(league_ids)
+        self.interval = interval
+        self.jitter = jitter
+        self.idle_interval = idle_interval
+        self.snapshot = None
+        self.history = history or HistoryStore()
+        self._ingested = set()
+        self._members = MappingProxyType({})
+        self._picks = MappingProxyType({})
+        self._picks_matrix = build_picks_matrix({})
+        self._rankers = {}  # league id -> (row positions in the picks matrix, IncrementalRanker)
+        self._picks_gameweek = None
+        self._picks_retry = {}  # entry id -> (misses, time to retry) for picks that could not be fetched
+        self._members_loaded_at = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='fpl-live-poller', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def poll_now(self):
+        """Ask the worker to poll immediately, unless it polled within MIN_REFRESH_SECONDS"""
+        if self.snapshot and time.time() - self.snapshot.fetched_at < MIN_REFRESH_SECONDS:
+            return False
+        self._wake.set()
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                delay = self._poll()
+            except Exception:
+                # Keep the last good snapshot and try again on the normal schedule
+                delay = self.interval
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _poll(self):
+        gameweek = self.api.get_current_gameweek()
+        fixtures, live, *standings = self.api.fetch_many(
+            [(self.api.fetch_fixtures, gameweek), (self.api.fetch_event_live, gameweek)]
+            + [(self.api.fetch_league_standings, league_id) for league_id in self.league_ids]
+        )
+        # Anything that failed this round keeps its value from the previous snapshot
+        previous = self.snapshot if self.snapshot and self.snapshot.gameweek == gameweek else None
+        fixtures = tuple(fixtures) if fixtures is not None else (previous.fixtures if previous else ())
+        live = tuple(live.get('elements', [])) if live is not None else (previous.live if previous else ())
+        standings = {
+            **(previous.standings if previous else {}),
+            **{league_id: page for league_id, page in zip(self.league_ids, standings) if page},
+        }
+
+        now = time.time()
+        if gameweek != self._picks_gameweek:
+            self._picks = MappingProxyType({})
+            self._picks_matrix = build_picks_matrix({})
+            self._rankers = {}
+            self._picks_retry = {}
+            self._picks_gameweek = gameweek
+            self._members_loaded_at = 0
+        if now - self._members_loaded_at >= CACHE_POLICIES['standings']['ttl']:
+            self._reload_members()
+            self._members_loaded_at = now
+
+        # Before the season there is no current event, so there are no picks to fetch
+        bootstrap = self.api.get_bootstrap()
+        if bootstrap and bootstrap.current_event:
+            self._fetch_picks(gameweek, now)
+
+        points = live_stat_vector(live)
+        minutes = live_stat_vector(live, 'minutes')
+        multipliers = self._multipliers(minutes, fixtures)
+        for array in (points, minutes, multipliers):
+            array.setflags(write=False)
+        live_ranks = self._live_ranks(points, multipliers)
+
+        delay = next_poll_delay(fixtures, self.interval, self.jitter)
+        delay = self.idle_interval if delay is None else min(delay, self.idle_interval)
+        now = time.time()
+        self.snapshot = LiveSnapshot(
+            gameweek=gameweek,
+            fixtures=fixtures,
+            live=live,
+            standings=MappingProxyType(standings),
+            picks=self._picks,
+            picks_matrix=self._picks_matrix,
+            points=points,
+            minutes=minutes,
+            multipliers=multipliers,
+            members=self._members,
+            live_ranks=MappingProxyType(live_ranks),
+            fetched_at=now,
+            next_poll_at=now + delay,
+        )
+        self._ingest_finished()
+        return delay
+
+    def _reload_members(self):
+        """Reload league members, keeping a league's previous members if its standings failed to load"""
+        members = {
+            league_id: df if not df.empty or league_id not in self._members else self._members[league_id]
+            for league_id, df in self._league_members().items()
+        }
+        changed = members.keys() != self._members.keys() or any(
+            set(df['entry']) != set(self._members[league_id]['entry']) for league_id, df in members.items()
+        )
+        self._members = MappingProxyType(members)
+        if changed:
+            self._rankers = {}
+
+    def _fetch_picks(self, gameweek, now):
+        """Fetch picks for tracked entries that have none yet, skipping entries still backing off"""
+        # Picks are locked at the deadline, so each entry is fetched once per gameweek
+        entries = dict.fromkeys(entry for df in self._members.values() for entry in df['entry'])
+        missing = [entry for entry in entries
+                   if entry not in self._picks and self._picks_retry.get(entry, (0, 0))[1] <= now]
+        if not missing:
+            return
+        fetched = self.api.get_picks_for_entries(missing, gameweek)
+        for entry in missing:
+            if fetched.get(entry):
+                self._picks_retry.pop(entry, None)
+            else:
+                misses = self._picks_retry.get(entry, (0, 0))[0] + 1
+                wait = min(LIVE_PICKS_RETRY_SECONDS * 2 ** (misses - 1), self.idle_interval)
+                self._picks_retry[entry] = (misses, now + wait)
+        found = {entry: picks for entry, picks in fetched.items() if picks}
+        if found:
+            self._picks = MappingProxyType({**self._picks, **found})
+            self._picks_matrix = build_picks_matrix(self._picks)
+            self._rankers = {}
+
+    def _ingest_finished(self):
+        """Write the last finished gameweek to the history store, once"""
+        bootstrap = self.api.get_bootstrap()
+        gameweek = last_finished_gameweek(bootstrap) if bootstrap else None
+        if gameweek is None or gameweek in self._ingested:
+            return
+        try:
+            if gameweek not in self.history.ingested_gameweeks():
+                ingest_gameweek(self.api, self.history, gameweek, TRACKED_LEAGUES)
+            if gameweek in self.history.ingested_gameweeks():
+                self._ingested.add(gameweek)
+        except Exception:
+            # Incomplete gameweeks stay open and are retried on the next poll
+            pass
+
+    def _multipliers(self, minutes, fixtures):
+        """Projected multipliers for every tracked manager, raw picks if bootstrap is unavailable"""
+        bootstrap = self.api.get_bootstrap()
+        if bootstrap is None:
+            return pick_multipliers(self._picks_matrix)
+        did_not_play = did_not_play_vector(bootstrap.element_vector('team'), minutes, fixtures)
+        return projected_multipliers(self._picks_matrix, bootstrap.element_vector('element_type'), minutes, did_not_play)
+
+    def _live_ranks(self, points, multipliers):
+        """Update each league's incremental ranker and return its table with rank movements"""
+        live_ranks = {}
+        for league_id, members in self._members.items():
+            if league_id not in self._rankers:
+                rows = np.flatnonzero(np.isin(self._picks_matrix.entries, members['entry']))
+                matrix = subset(self._picks_matrix, rows)
+                ranker = IncrementalRanker(matrix, points, multipliers[rows], matrix.previous_total)
+                self._rankers[league_id] = (rows, ranker)
+                moves = pd.DataFrame(columns=['entry', 'movement'])
+            else:
+                rows, ranker = self._rankers[league_id]
+                moves = ranker.update(points, multipliers[rows])
+            table = ranker.standings().merge(moves[['entry', 'movement']], on='entry', how='left')
+            live_ranks[league_id] = table.fillna({'movement': 0}).astype({'movement': int})
+        return live_ranks
+
+    def _league_members(self):
+        members = {}
+        for league_id in self.league_ids:
+            df = self.api.get_league_standings_df(league_id)
+            members[league_id] = df.reindex(columns=['entry', 'entry_name', 'player_name']).drop_duplicates('entry')
+        return members
+
+
+@st.cache_resource
+def get_live_poller(_api):
+    """Start the single live poller for this process"""
+    return LivePoller(_api).start()
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from utils.live_scoring import SQUAD_SIZE, gather
+
+ENTRY_BITS = 32  # Sort keys pack (-total, entry) into one int64
+
+
+class IncrementalRanker:
+    """Live league standings kept in sorted arrays and updated from point deltas.
+
+    Managers are ordered by total (season total before the gameweek plus
+    live points) descending, then entry id. An element -> managers inverted
+    index means a poll only rescores the managers holding an element whose
+    points changed (or whose multipliers changed after auto-subs). Only those
+    managers are taken out of the sorted arrays and put back in, and only
+    the stretch of the table between their old and new positions is re-ranked.
+    """
+
+    def __init__(self, matrix, points, multipliers, base_totals=None):
+        self.entries = matrix.entries
+        self.elements = matrix.elements
+        self.transfer_cost = matrix.transfer_cost
+        self.multipliers = np.array(multipliers, dtype=np.int32)
+        self.points = gather(np.asarray(points), np.arange(self._element_span(points)))
+        self.base_totals = np.zeros(len(self.entries), dtype=np.int64) if base_totals is None else np.asarray(base_totals, dtype=np.int64)
+
+        # Inverted index in CSR form: managers holding element e are managers[start[e]:start[e + 1]]
+        flat = self.elements.ravel()
+        order = np.argsort(flat, kind='stable')
+        self._holders = (order // SQUAD_SIZE).astype(np.int32)
+        self._holder_start = np.concatenate(([0], np.cumsum(np.bincount(flat, minlength=len(self.points)))))
+
+        self.totals = self.base_totals + self._score(np.arange(len(self.entries)))
+        self._order = np.lexsort((self.entries, -self.totals))
+        self._keys = self._sort_keys(self._order)
+        self._position = np.empty(len(self.entries), dtype=np.int64)
+        self._position[self._order] = np.arange(len(self.entries))
+        self.ranks = self._ranks_at(np.arange(len(self.entries)))[np.argsort(self._order)]
+
+    def _element_span(self, points):
+        return max(len(points), int(self.elements.max(initial=0)) + 1) if len(self.elements) else len(points)
+
+    def _score(self, managers):
+        """Live gameweek points (after transfer hits) for a subset of managers"""
+        return (self.points[self.elements[managers]] * self.multipliers[managers]).sum(axis=1) - self.transfer_cost[managers]
+
+    def _sort_keys(self, managers):
+        return (-self.totals[managers]) * (1 << ENTRY_BITS) + self.entries[managers]
+
+    def _ranks_at(self, positions):
+        """Competition ranks (ties share the best rank) for positions in the sorted table"""
+        neg_totals = self._keys // (1 << ENTRY_BITS)
+        return np.searchsorted(neg_totals, neg_totals[positions], side='left') + 1
+
+    def standings(self):
+        """Current table as a DataFrame of entry, total and rank, best first"""
+        return pd.DataFrame({
+            'entry': self.entries[self._order],
+            'total': self.totals[self._order],
+            'rank': self.ranks[self._order],
+        })
+
+    def update(self, points, multipliers=None):
+        """Apply a new live points vector (and optionally new multipliers).
+
+        Returns the rank movements as a DataFrame of entry, previous_rank,
+        rank, movement (positive = climbed) and total.
+        """
+        points = gather(np.asarray(points), np.arange(self._element_span(points)))
+        changed = np.flatnonzero(points[:len(self.points)] != self.points[:len(points)])
+        self.points = points
+
+        # Managers holding any changed element, via the inverted index
+        starts, ends = self._holder_start[changed], self._holder_start[changed + 1]
+        lengths = ends - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        affected = self._holders[offsets]
+        if multipliers is not None:
+            multipliers = np.asarray(multipliers, dtype=np.int32)
+            rescored = np.flatnonzero((multipliers != self.multipliers).any(axis=1))
+            affected = np.concatenate((affected, rescored))
+            self.multipliers = multipliers.copy()
+        affected = np.unique(affected)
+        if len(affected) == 0:
+            return self._movements(np.zeros(0, dtype=np.int64))
+
+        previous_totals = self.totals[affected]
+        self.totals[affected] = self.base_totals[affected] + self._score(affected)
+        moved = affected[self.totals[affected] != previous_totals]
+        if len(moved) == 0:
+            return self._movements(np.zeros(0, dtype=np.int64))
+
+        # Pull the moved managers out of the sorted arrays and insert them at their new keys
+        old_positions = self._position[moved]
+        keep = np.ones(len(self._order), dtype=bool)
+        keep[old_positions] = False
+        rest_order, rest_keys = self._order[keep], self._keys[keep]
+        new_keys = self._sort_keys(moved)
+        by_key = np.argsort(new_keys)
+        moved, new_keys = moved[by_key], new_keys[by_key]
+        insert_at = np.searchsorted(rest_keys, new_keys)
+        self._order = np.insert(rest_order, insert_at, moved)
+        self._keys = np.insert(rest_keys, insert_at, new_keys)
+
+        # Only positions between the first and last touched slot change order
+        new_positions = insert_at + np.arange(len(moved))
+        low = int(min(old_positions.min(), new_positions.min()))
+        high = int(max(old_positions.max(), new_positions.max()))
+        # Managers below tied with the lowest old or new total can change rank too
+        floor = min(self.totals[self._order[high]], previous_totals.min())
+        neg_totals = self._keys // (1 << ENTRY_BITS)
+        high = int(np.searchsorted(neg_totals, -floor, side='right')) - 1
+
+        window = np.arange(low, high + 1)
+        self._position[self._order[window]] = window
+        return self._movements(window)
+
+    def _movements(self, window):
+        managers = self._order[window]
+        previous = self.ranks[managers]
+        current = self._ranks_at(window)
+        self.ranks[managers] = current
+        moved = current != previous
+        return pd.DataFrame({
+            'entry': self.entries[managers][moved],
+            'previous_rank': previous[moved],
+            'rank': current[moved],
+            'movement': previous[moved] - current[moved],
+            'total': self.totals[managers][moved],
+        })
@@ -0,0 +1,42 @@
+import random
+from datetime import datetime, timezone
+from utils.constants import LIVE_POLL_SECONDS, LIVE_POLL_JITTER
+
+
+def _kickoff(fixture):
+    kickoff = fixture.get('kickoff_time')
+    return datetime.fromisoformat(kickoff.replace('Z', '+00:00')) if kickoff else None
+
+
+def fixture_status(fixtures):
+    """Count fixtures by state: total, live (kicked off, not finished), finished, upcoming"""
+    fixtures = fixtures or []
+    finished = sum(1 for f in fixtures if f.get('finished') or f.get('finished_provisional'))
+    live = sum(1 for f in fixtures if f.get('started') and not (f.get('finished') or f.get('finished_provisional')))
+    return {
+        'total': len(fixtures),
+        'live': live,
+        'finished': finished,
+        'upcoming': len(fixtures) - live - finished,
+    }
+
+
+def next_poll_delay(fixtures, interval=LIVE_POLL_SECONDS, jitter=LIVE_POLL_JITTER, now=None):
+    """Seconds until the next live poll, or None to stop polling.
+
+    While any fixture is in progress the delay is `interval` plus random
+    jitter. Otherwise polling sleeps until the next kickoff, and stops
+    entirely once nothing in the gameweek is left to start.
+    """
+    if fixture_status(fixtures)['live']:
+        return interval + random.uniform(0, jitter)
+
+    now = now or datetime.now(timezone.utc)
+    # Kickoffs already past but not yet flagged as started are polled at the normal interval
+    kickoffs = [
+        _kickoff(f) for f in fixtures or []
+        if _kickoff(f) and not f.get('started') and not f.get('finished')
+    ]
+    if not kickoffs:
+        return None
+    return max((min(kickoffs) - now).total_seconds(), interval) + random.uniform(0, jitter)
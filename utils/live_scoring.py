@@ -0,0 +1,188 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+SQUAD_SIZE = 15
+STARTING_XI = 11
+
+# Picks of many managers as aligned arrays; row i of every field belongs to entries[i]
+PicksMatrix = namedtuple('PicksMatrix', [
+    'entries',        # (M,) entry ids
+    'elements',       # (M, 15) element ids in pick position order (0-10 starters, 11-14 bench)
+    'captain',        # (M, 15) bool
+    'vice_captain',   # (M, 15) bool
+    'chips',          # (M,) active chip name or ''
+    'transfer_cost',  # (M,) points deducted for extra transfers this gameweek
+    'previous_total', # (M,) season total before this gameweek
+])
+
+
+def build_picks_matrix(picks_by_entry):
+    """Stack picks payloads ({entry: get_team_picks result}) into a PicksMatrix.
+
+    Entries with missing or incomplete picks are left out.
+    """
+    rows = [
+        (entry, sorted(data['picks'], key=lambda pick: pick['position']), data)
+        for entry, data in picks_by_entry.items()
+        if data and len(data.get('picks', [])) == SQUAD_SIZE
+    ]
+    if not rows:
+        empty = np.zeros((0, SQUAD_SIZE))
+        return PicksMatrix(np.zeros(0, dtype=np.int64), empty.astype(np.int32), empty.astype(bool),
+                           empty.astype(bool), np.zeros(0, dtype=object), np.zeros(0, dtype=np.int32),
+                           np.zeros(0, dtype=np.int64))
+
+    entries = np.array([entry for entry, _, _ in rows], dtype=np.int64)
+    histories = [data.get('entry_history') or {} for _, _, data in rows]
+    picks = [pick for _, squad, _ in rows for pick in squad]
+    shape = (len(rows), SQUAD_SIZE)
+    return PicksMatrix(
+        entries=entries,
+        elements=np.fromiter((p['element'] for p in picks), dtype=np.int32, count=len(picks)).reshape(shape),
+        captain=np.fromiter((p['is_captain'] for p in picks), dtype=bool, count=len(picks)).reshape(shape),
+        vice_captain=np.fromiter((p['is_vice_captain'] for p in picks), dtype=bool, count=len(picks)).reshape(shape),
+        chips=np.array([data.get('active_chip') or '' for _, _, data in rows], dtype=object),
+        transfer_cost=np.array([history.get('event_transfers_cost', 0) for history in histories], dtype=np.int32),
+        # total_points already has this gameweek's points and hit applied
+        previous_total=np.array([
+            history.get('total_points', 0) - history.get('points', 0) + history.get('event_transfers_cost', 0)
+            for history in histories
+        ], dtype=np.int64),
+    )
+
+
+def subset(matrix, rows):
+    """PicksMatrix restricted to the given row positions"""
+    return PicksMatrix(*(field[rows] for field in matrix))
+
+
+def live_stat_vector(live_elements, stat='total_points'):
+    """Array indexed by element id holding one live stat (0 for unknown elements)"""
+    live_elements = list(live_elements)
+    if not live_elements:
+        return np.zeros(1, dtype=np.int32)
+    ids = np.fromiter((e['id'] for e in live_elements), dtype=np.int64, count=len(live_elements))
+    values = np.fromiter((e['stats'].get(stat, 0) for e in live_elements), dtype=np.int32, count=len(live_elements))
+    vector = np.zeros(ids.max() + 1, dtype=np.int32)
+    vector[ids] = values
+    return vector
+
+
+def gather(vector, elements):
+    """Look up vector[elements], treating ids beyond the vector as 0"""
+    padded = np.zeros(max(len(vector), int(elements.max(initial=0)) + 1), dtype=vector.dtype)
+    padded[:len(vector)] = vector
+    return padded[elements]
+
+
+def pick_multipliers(matrix):
+    """(M, 15) scoring multipliers: starters 1, bench 0, captain 2.
+
+    Bench Boost scores the bench at 1 and Triple Captain makes the captain 3.
+    """
+    multipliers = np.zeros(matrix.elements.shape, dtype=np.int32)
+    multipliers[:, :STARTING_XI] = 1
+    multipliers[matrix.chips == 'bboost', STARTING_XI:] = 1
+    captain_multiplier = np.where(matrix.chips == '3xc', 3, 2)[:, None]
+    return np.where(matrix.captain, captain_multiplier, multipliers)
+
+
+def live_totals(matrix, points, multipliers=None):
+    """Live gameweek score per manager (after transfer hits) as one gather-multiply-sum"""
+    if multipliers is None:
+        multipliers = pick_multipliers(matrix)
+    return (gather(points, matrix.elements) * multipliers).sum(axis=1) - matrix.transfer_cost
+
+
+def live_table(matrix, points, multipliers=None):
+    """DataFrame of entry, live points, acting captain, auto-subs and chip, best score first"""
+    if multipliers is None:
+        multipliers = pick_multipliers(matrix)
+    rows = np.arange(len(matrix.entries))
+    captain_col = np.argmax(matrix.captain, axis=1)
+    vice_col = np.argmax(matrix.vice_captain, axis=1)
+    # The vice-captain only carries a multiplier above 1 once promoted
+    armband_col = np.where(multipliers[rows, vice_col] > 1, vice_col, captain_col)
+    bench_used = (multipliers[:, STARTING_XI:] > 0).sum(axis=1)
+    table = pd.DataFrame({
+        'entry': matrix.entries,
+        'live_points': live_totals(matrix, points, multipliers),
+        'captain': matrix.elements[rows, armband_col],
+        'auto_subs': np.where(matrix.chips == 'bboost', 0, bench_used),
+        'chip': matrix.chips,
+        'transfer_cost': matrix.transfer_cost,
+    })
+    table = table.sort_values(['live_points', 'entry'], ascending=[False, True], ignore_index=True)
+    table['live_rank'] = table['live_points'].rank(method='min', ascending=False).astype(int)
+    return table
+
+
+# Starting XI formation limits per element_type (GKP, DEF, MID, FWD)
+FORMATION_MIN = np.array([0, 1, 3, 2, 1])
+FORMATION_MAX = np.array([0, 1, 5, 5, 3])
+BENCH_GK = STARTING_XI
+OUTFIELD_BENCH = range(STARTING_XI + 1, SQUAD_SIZE)
+
+
+def did_not_play_vector(element_teams, minutes, fixtures):
+    """Bool vector by element id: 0 minutes and every team fixture this gameweek finished.
+
+    Players of teams without a fixture (blank gameweek) count as not playing.
+    """
+    team_done = np.ones(int(element_teams.max(initial=0)) + 1, dtype=bool)
+    for fixture in fixtures:
+        if not (fixture.get('finished') or fixture.get('finished_provisional')):
+            team_done[[fixture['team_h'], fixture['team_a']]] = False
+    return (gather(minutes, np.arange(len(element_teams))) == 0) & team_done[element_teams]
+
+
+def projected_multipliers(matrix, element_types, minutes, did_not_play):
+    """(M, 15) multipliers after projected automatic substitutions and vice-captaincy.
+
+    All managers are resolved together: one pass for the goalkeeper and one
+    per outfield bench slot in bench order. A starter who did not play is
+    replaced by the next bench player with minutes, provided the XI stays
+    within FORMATION_MIN/FORMATION_MAX. If the captain did not play and the
+    vice-captain is in the final XI and did, the armband passes to the vice.
+    Bench Boost squads keep all fifteen players and only get the vice rule.
+    """
+    rows = np.arange(len(matrix.entries))
+    types = gather(element_types, matrix.elements)
+    out = gather(did_not_play, matrix.elements)
+    played = gather(minutes, matrix.elements) > 0
+    bench_boost = matrix.chips == 'bboost'
+
+    active = np.zeros(matrix.elements.shape, dtype=bool)
+    active[:, :STARTING_XI] = True
+    active[bench_boost] = True
+
+    # Goalkeeper: only the bench goalkeeper can come on for the starting one
+    swap = ~bench_boost & out[:, 0] & played[:, BENCH_GK]
+    active[swap, 0] = False
+    active[swap, BENCH_GK] = True
+
+    for slot in OUTFIELD_BENCH:
+        # Current XI composition per manager, as counts per element_type
+        counts = np.zeros((len(rows), len(FORMATION_MIN)), dtype=np.int32)
+        np.add.at(counts, (np.repeat(rows, SQUAD_SIZE), types.ravel()), active.ravel())
+
+        incoming = types[:, slot]
+        same_type = types[:, 1:STARTING_XI] == incoming[:, None]
+        leaves_enough = counts[rows[:, None], types[:, 1:STARTING_XI]] - 1 >= FORMATION_MIN[types[:, 1:STARTING_XI]]
+        room_for_incoming = (counts[rows, incoming] + 1 <= FORMATION_MAX[incoming])[:, None]
+        valid = active[:, 1:STARTING_XI] & out[:, 1:STARTING_XI] & (same_type | (leaves_enough & room_for_incoming))
+
+        sub = ~bench_boost & played[:, slot] & valid.any(axis=1)
+        leaving = np.argmax(valid, axis=1) + 1
+        active[rows[sub], leaving[sub]] = False
+        active[sub, slot] = True
+
+    multipliers = active.astype(np.int32)
+    captain_multiplier = np.where(matrix.chips == '3xc', 3, 2)
+    captain_col = np.argmax(matrix.captain, axis=1)
+    vice_col = np.argmax(matrix.vice_captain, axis=1)
+    promote = out[rows, captain_col] & active[rows, vice_col] & played[rows, vice_col]
+    armband = np.where(promote, vice_col, captain_col)
+    multipliers[rows, armband] *= captain_multiplier
+    return multipliers
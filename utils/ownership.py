@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def ownership_matrices(matrix, multipliers, n_elements=None):
+    """Sparse managers x elements matrices built from a PicksMatrix.
+
+    Returns (owned, weights, captains): 1 where a manager has the element,
+    the element's scoring multiplier for that manager, and 1 for the
+    captain. Columns are element ids, so n_elements defaults to the
+    largest picked id + 1.
+    """
+    managers, slots = matrix.elements.shape
+    if n_elements is None:
+        n_elements = int(matrix.elements.max(initial=0)) + 1
+    rows = np.repeat(np.arange(managers), slots)
+    cols = matrix.elements.ravel()
+    shape = (managers, n_elements)
+    owned = sparse.csr_matrix((np.ones(len(cols), dtype=np.int32), (rows, cols)), shape=shape)
+    weights = sparse.csr_matrix((np.asarray(multipliers).ravel().astype(np.int32), (rows, cols)), shape=shape)
+    captains = sparse.csr_matrix((matrix.captain.ravel().astype(np.int32), (rows, cols)), shape=shape)
+    return owned, weights, captains
+
+
+def ownership_summary(matrix, multipliers, n_elements=None):
+    """Per-element owners, ownership %, captaincy % and effective ownership % (column reductions)"""
+    owned, weights, captains = ownership_matrices(matrix, multipliers, n_elements)
+    managers = max(owned.shape[0], 1)
+    owners = np.asarray(owned.sum(axis=0)).ravel()
+    elements = np.flatnonzero(owners)
+    summary = pd.DataFrame({
+        'element': elements,
+        'owners': owners[elements],
+        'ownership': 100 * owners[elements] / managers,
+        'captaincy': 100 * np.asarray(captains.sum(axis=0)).ravel()[elements] / managers,
+        # Effective ownership counts captains twice (three times with Triple Captain) and benched players zero times
+        'effective_ownership': 100 * np.asarray(weights.sum(axis=0)).ravel()[elements] / managers,
+    })
+    return summary.sort_values(['owners', 'effective_ownership'], ascending=False, ignore_index=True)
+
+
+def differentials(matrix, multipliers, max_ownership=None, n_elements=None):
+    """Each manager's picks that few others have, as entry / element / ownership rows.
+
+    With max_ownership=None a differential is a pick no other manager in
+    the group owns; otherwise any pick at or below that ownership percentage.
+    """
+    owned, _, _ = ownership_matrices(matrix, multipliers, n_elements)
+    managers = max(owned.shape[0], 1)
+    owners = np.asarray(owned.sum(axis=0)).ravel()
+    ownership = 100 * owners / managers
+    rare = owners == 1 if max_ownership is None else ownership <= max_ownership
+    # Row-wise mask of each manager's picks against the rare-element column vector; the
+    # product keeps masked-out picks as explicit zeros, so drop them before reading coordinates
+    picked = owned.multiply(rare.astype(np.int32)[None, :]).tocsr()
+    picked.eliminate_zeros()
+    picked = picked.tocoo()
+    return pd.DataFrame({
+        'entry': matrix.entries[picked.row],
+        'element': picked.col,
+        'ownership': ownership[picked.col],
+    }).sort_values(['entry', 'ownership'], ignore_index=True)
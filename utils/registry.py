@@ -0,0 +1,53 @@
+import os
+from collections import namedtuple
+import streamlit as st
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEAGUES_CONFIG = os.environ.get('QFPL_LEAGUES_CONFIG', os.path.join(ROOT_DIR, 'config', 'leagues.toml'))
+
+# One registered club for the selected season; league is None until its mini league is known
+Club = namedtuple('Club', ['code', 'name', 'color', 'league'])
+
+
+class LeagueRegistry:
+    """Clubs, leagues and settings for one season of the league registry, with lookups precomputed.
+
+    Club and league lookups are plain dicts built once here.
+    """
+
+    def __init__(self, config, season=None):
+        self.season = season or config['current_season']
+        if self.season not in config.get('seasons', {}):
+            raise ValueError(f"Season {self.season!r} is not in the league registry")
+        settings = config['seasons'][self.season]
+        self.name = settings.get('name', self.season)
+        self.main_league = int(settings['main_league'])
+        self.home_club = settings['home_club']
+        self.squad_size = int(settings.get('squad_size', 11))
+        self.counting_scores = int(settings.get('counting_scores', self.squad_size))
+
+        leagues = settings.get('club_leagues', {})
+        self.clubs = {
+            code: Club(code, club['name'], club['color'], int(leagues[code]) if code in leagues else None)
+            for code, club in config.get('clubs', {}).items()
+            if self.season in club.get('seasons', [self.season])
+        }
+        self.h2h_leagues = {name: int(league) for name, league in settings.get('h2h_leagues', {}).items()}
+        self.club_leagues = {code: club.league for code, club in self.clubs.items() if club.league is not None}
+
+
+def load_registry(path=LEAGUES_CONFIG, season=None):
+    """Parse the registry file for a season (QFPL_SEASON, else the file's current_season)"""
+    with open(path, 'rb') as f:
+        return LeagueRegistry(tomllib.load(f), season or os.environ.get('QFPL_SEASON'))
+
+
+@st.cache_resource
+def get_registry():
+    """Load the league registry once per process"""
+    return load_registry()
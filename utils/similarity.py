@@ -0,0 +1,79 @@
+from collections import namedtuple
+import numpy as np
+
+# Set bits per byte value, the popcount fallback for numpy < 2.0
+_BYTE_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+CHUNK_BYTES = 32 * 1024 * 1024  # Cap on the (rows, M, words) AND buffer per chunk
+
+# All-pairs squad similarity for one group of managers; row/column i belongs to entries[i]
+SimilarityMatrix = namedtuple('SimilarityMatrix', [
+    'entries',   # (M,) entry ids
+    'common',    # (M, M) number of shared players
+    'jaccard',   # (M, M) shared / combined players
+    'weighted',  # (M, M) weighted Jaccard with the captain counted at its multiplier
+])
+
+
+def popcount(words):
+    """Set bits in each uint64 word"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1)
+
+
+def squad_bitsets(elements, n_elements=None, mask=True):
+    """Pack each row of element ids into a fixed-width bitset of (M, ceil(n_elements / 64)) uint64 words.
+
+    `mask` (broadcast against elements) limits which picks are set.
+    """
+    if n_elements is None:
+        n_elements = int(elements.max(initial=0)) + 1
+    present = np.zeros((len(elements), -(-n_elements // 64) * 64), dtype=bool)
+    present[np.arange(len(elements))[:, None], elements] = mask
+    return np.ascontiguousarray(np.packbits(present, axis=1)).view(np.uint64)
+
+
+def intersection_counts(bits):
+    """(M, M) popcount(a & b) for every pair of bitset rows, in row chunks to bound memory"""
+    managers, words = bits.shape
+    counts = np.zeros((managers, managers), dtype=np.int32)
+    step = max(1, CHUNK_BYTES // max(managers * words * 8, 1))
+    for start in range(0, managers, step):
+        block = bits[start:start + step, None, :] & bits[None, :, :]
+        counts[start:start + step] = popcount(block).sum(axis=2, dtype=np.int32)
+    return counts
+
+
+def captaincy_weights(matrix):
+    """(M, 15) pick weights: 1 per player, the captain at 2 (3 with Triple Captain)"""
+    captain_multiplier = np.where(matrix.chips == '3xc', 3, 2)[:, None]
+    return np.where(matrix.captain, captain_multiplier, 1)
+
+
+def similarity_matrix(matrix, n_elements=None):
+    """Overlap, Jaccard and captaincy-weighted Jaccard between every pair of managers.
+
+    Squads are bitsets over element ids, so each pair costs one AND and a
+    popcount. The weighted variant splits weights into threshold layers
+    (weight >= 1, >= 2, >= 3): summed over layers, |a & b| gives the sum of
+    per-player minimums and |a | b| the sum of maximums.
+    """
+    if n_elements is None:
+        n_elements = int(matrix.elements.max(initial=0)) + 1
+    weights = captaincy_weights(matrix)
+    minimums = np.zeros((len(matrix.entries), len(matrix.entries)), dtype=np.int32)
+    maximums = np.zeros_like(minimums)
+    common = None
+    for level in range(1, int(weights.max(initial=1)) + 1):
+        bits = squad_bitsets(matrix.elements, n_elements, weights >= level)
+        sizes = popcount(bits).sum(axis=1, dtype=np.int32)
+        shared = intersection_counts(bits)
+        minimums += shared
+        maximums += sizes[:, None] + sizes[None, :] - shared
+        if common is None:
+            common = shared
+            union = maximums.copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        jaccard = np.where(union > 0, common / union, 0.0)
+        weighted = np.where(maximums > 0, minimums / maximums, 0.0)
+    return SimilarityMatrix(matrix.entries, common, jaccard, weighted)
@@ -0,0 +1,93 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIMULATIONS = 100_000
+CHUNK_CELLS = 4_000_000  # Draws per chunk (simulations x managers), ~16MB of float32
+RELEGATION_ZONE = 3      # Bottom places counted as the relegation zone
+MIN_HISTORY = 3          # Gameweeks of history before a manager's own distribution is trusted
+DEFAULT_MEAN = 50.0      # Used when no history is stored at all
+DEFAULT_STD = 15.0
+
+
+def points_distributions(history, entries):
+    """Per-entry (mean, std) of net gameweek points, aligned to `entries`.
+
+    history has entry and points columns (one row per entry and gameweek,
+    transfer hits already deducted). Managers with fewer than MIN_HISTORY
+    gameweeks get the pooled league mean and spread.
+    """
+    entries = pd.Index(entries)
+    if history is None or history.empty:
+        return np.full(len(entries), DEFAULT_MEAN), np.full(len(entries), DEFAULT_STD)
+    stats = history.groupby('entry')['points'].agg(['mean', 'std', 'count']).reindex(entries)
+    pooled_mean = history['points'].mean()
+    pooled_std = history['points'].std() if len(history) > 1 else DEFAULT_STD
+    trusted = stats['count'].fillna(0) >= MIN_HISTORY
+    means = np.where(trusted, stats['mean'], pooled_mean)
+    stds = np.where(trusted, stats['std'].fillna(pooled_std), pooled_std)
+    return means.astype(float), np.nan_to_num(stds, nan=DEFAULT_STD).astype(float)
+
+
+def _simulate_chunk(seed, simulations, totals, means, stds, remaining, relegation_zone):
+    """Outcome counts for one chunk: (title, top 3, relegation, sum of finishing positions) per manager"""
+    rng = np.random.default_rng(seed)
+    n_managers = len(totals)
+    # The sum of `remaining` independent normal gameweeks is itself normal,
+    # so one draw per manager covers the rest of the season
+    spread = (stds * np.sqrt(remaining)).astype(np.float32)
+    draws = rng.standard_normal((simulations, n_managers), dtype=np.float32)
+    final = totals + np.rint(draws * spread + (means * remaining).astype(np.float32))
+    # Points are whole numbers, so a uniform [0, 1) jitter breaks ties at random
+    final += rng.random(final.shape, dtype=np.float32)
+    order = np.argsort(-final, axis=1)
+    position = np.empty_like(order)
+    position[np.arange(simulations)[:, None], order] = np.arange(n_managers)
+    return (
+        (position == 0).sum(axis=0),
+        (position < 3).sum(axis=0),
+        (position >= n_managers - relegation_zone).sum(axis=0),
+        position.sum(axis=0, dtype=np.int64),
+    )
+
+
+def simulate_league(entries, totals, means, stds, remaining, simulations=DEFAULT_SIMULATIONS,
+                    seed=None, workers=1, relegation_zone=RELEGATION_ZONE):
+    """Monte Carlo finishing probabilities for a league over its remaining gameweeks.
+
+    Each simulation draws every manager's points for the remaining
+    gameweeks from their own per-gameweek mean and spread, adds them to
+    the current totals and ranks the league. Simulations run in chunks of at
+    most CHUNK_CELLS draws; each chunk gets its own child of one
+    SeedSequence, so a seed gives the same result with any `workers`.
+    With workers > 1 the chunks fan out over a pool of spawned (never
+    forked) worker processes.
+    Returns a DataFrame of entry, title, top3, relegation (probabilities)
+    and expected_rank, sorted by expected rank.
+    """
+    totals = np.asarray(totals, dtype=np.float32)
+    means = np.asarray(means, dtype=float)
+    stds = np.asarray(stds, dtype=float)
+    n_managers = len(totals)
+    remaining = max(int(remaining), 0)
+    per_chunk = max(1, CHUNK_CELLS // max(n_managers, 1))
+    sizes = [min(per_chunk, simulations - start) for start in range(0, simulations, per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(s, size, totals, means, stds, remaining, relegation_zone) for s, size in zip(seeds, sizes)]
+
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        chunks = [_simulate_chunk(*a) for a in args]
+    title, top3, relegation, positions = (np.sum(counts, axis=0) for counts in zip(*chunks))
+
+    result = pd.DataFrame({
+        'entry': list(entries),
+        'title': title / simulations,
+        'top3': top3 / simulations,
+        'relegation': relegation / simulations,
+        'expected_rank': positions / simulations + 1,
+    })
+    return result.sort_values('expected_rank', ignore_index=True)
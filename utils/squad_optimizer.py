@@ -0,0 +1,109 @@
+import hashlib
+import time
+from collections import namedtuple
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import csr_matrix, eye, hstack, vstack
+
+MAX_PER_CLUB = 3
+STARTING_XI = 11
+BENCH_WEIGHT = 0.1  # Bench points count a little so the solver still buys useful cover
+SOLVER_TIME_LIMIT = 30  # Seconds before HiGHS returns its best incumbent
+
+# Solved squad: element ids, starting XI and captain, with objective breakdown
+SquadSolution = namedtuple('SquadSolution', [
+    'squad',            # 15 element ids
+    'starters',         # 11 element ids in the starting XI
+    'captain',          # element id
+    'cost',             # total now_cost (tenths of a million)
+    'projected_points', # XI points over the horizon with the captain doubled
+    'solve_seconds',    # wall time of the MILP solve
+    'status',           # scipy milp status message
+])
+
+
+def inputs_hash(bootstrap, points, budget, locked=(), banned=(), bench_weight=BENCH_WEIGHT):
+    """Key for caching a solution: a digest of every input optimize_squad reads"""
+    digest = hashlib.sha1(np.ascontiguousarray(points, dtype=np.float64).tobytes())
+    for column in ('id', 'now_cost', 'element_type', 'team'):
+        digest.update(bootstrap.players[column].to_numpy().tobytes())
+    digest.update(repr((int(budget), sorted(map(int, locked)), sorted(map(int, banned)), bench_weight)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def optimize_squad(bootstrap, points, budget, locked=(), banned=(), bench_weight=BENCH_WEIGHT):
+    """Pick the 15-man squad maximising projected points with scipy's MILP solver (HiGHS).
+
+    Variables per player are in-squad x, starting s and captain c (all
+    binary). The objective is the XI's points plus the captain's again,
+    plus bench_weight times the bench. Constraints: the squad matches the
+    position quotas (squad_select), costs at most `budget`, and has at most
+    MAX_PER_CLUB per club; the XI is eleven starters within each position's
+    squad_min_play/squad_max_play; one captain from the XI; s <= x, c <= s.
+    `locked` players must be in the squad and `banned` players can't be.
+    Returns a SquadSolution, or None when the problem is infeasible.
+    """
+    players = bootstrap.players
+    elements = players['id'].to_numpy()
+    n = len(elements)
+    value = np.asarray(points, dtype=float)[elements]
+    cost = players['now_cost'].to_numpy().astype(float)
+    position = players['element_type'].to_numpy()
+    team = players['team'].to_numpy()
+    positions = bootstrap.positions.set_index('id')
+
+    # Variable layout: [x (n), s (n), c (n)]; milp minimises, so negate the objective
+    objective = -np.concatenate([bench_weight * value, (1 - bench_weight) * value, value])
+    zeros = csr_matrix((1, n))
+    rows, lower, upper = [], [], []
+
+    def add(x_row, s_row, c_row, lo, hi):
+        rows.append(hstack([x_row, s_row, c_row]))
+        lower.append(lo)
+        upper.append(hi)
+
+    ones = csr_matrix(np.ones((1, n)))
+    add(ones, zeros, zeros, 15, 15)
+    add(csr_matrix(cost[None, :]), zeros, zeros, 0, budget)
+    add(zeros, ones, zeros, STARTING_XI, STARTING_XI)
+    add(zeros, zeros, ones, 1, 1)
+    for pos, quota in positions.iterrows():
+        mask = csr_matrix((position == pos).astype(float)[None, :])
+        add(mask, zeros, zeros, quota['squad_select'], quota['squad_select'])
+        add(zeros, mask, zeros, quota['squad_min_play'], quota['squad_max_play'])
+    for club in np.unique(team):
+        add(csr_matrix((team == club).astype(float)[None, :]), zeros, zeros, 0, MAX_PER_CLUB)
+    # s - x <= 0 and c - s <= 0, one row per player
+    identity = eye(n, format='csr')
+    empty = csr_matrix((n, n))
+    linking = [hstack([-identity, identity, empty]), hstack([empty, -identity, identity])]
+
+    constraints = LinearConstraint(
+        vstack(rows + linking, format='csr'),
+        np.concatenate([lower, np.full(2 * n, -np.inf)]),
+        np.concatenate([upper, np.zeros(2 * n)]),
+    )
+    lower_bounds = np.zeros(3 * n)
+    upper_bounds = np.ones(3 * n)
+    index = {int(e): i for i, e in enumerate(elements)}
+    lower_bounds[[index[int(e)] for e in locked if int(e) in index]] = 1
+    upper_bounds[[index[int(e)] for e in banned if int(e) in index]] = 0
+
+    started = time.perf_counter()
+    result = milp(objective, constraints=constraints, integrality=np.ones(3 * n),
+                  bounds=Bounds(lower_bounds, upper_bounds), options={'time_limit': SOLVER_TIME_LIMIT})
+    elapsed = time.perf_counter() - started
+    if result.x is None:
+        return None
+
+    chosen = np.round(result.x).astype(bool)
+    x, s, c = chosen[:n], chosen[n:2 * n], chosen[2 * n:]
+    return SquadSolution(
+        squad=[int(e) for e in elements[x]],
+        starters=[int(e) for e in elements[s]],
+        captain=int(elements[c][0]),
+        cost=int(cost[x].sum()),
+        projected_points=float(value[s].sum() + value[c].sum()),
+        solve_seconds=elapsed,
+        status=result.message,
+    )
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utils.single_flight import SingleFlight
+
+
+class SWRCache:
+    """In-memory stale-while-revalidate cache shared by every session.
+
+    `get(key, loader, ttl, grace)` returns a value younger than `ttl`
+    directly. Up to `ttl + grace` old it is still returned immediately, and
+    one background refresh is started for the key. Only a miss, or an entry
+    past its grace window, waits for `loader`. Loader results of None are
+    never cached, so a failed refresh keeps the last good value. Least
+    recently used keys are dropped beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries=5000, refresh_workers=2):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._flights = SingleFlight()
+        self._pool = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='fpl-swr')
+
+    def get(self, key, loader, ttl, grace=0):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < ttl:
+                return value
+            if age < ttl + grace:
+                self._refresh_in_background(key, loader)
+                return value
+        return self._flights.do(key, lambda: self._load(key, loader))
+
+    def _load(self, key, loader):
+        value = loader()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._flights.do(key, lambda: self._load(key, loader))
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._pool.submit(refresh)
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, match=None):
+        """Drop keys for which match(key) is true (every key when match is None); returns the dropped keys"""
+        with self._lock:
+            keys = [key for key in self._entries if match is None or match(key)]
+            for key in keys:
+                del self._entries[key]
+        return keys
+
+    def clear(self):
+        self.invalidate()
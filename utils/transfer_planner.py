@@ -0,0 +1,126 @@
+from itertools import combinations
+import numpy as np
+import pandas as pd
+
+MAX_PER_CLUB = 3
+HIT_COST = 4        # Points deducted per transfer beyond the free ones
+CANDIDATE_CHUNK = 64  # Incoming players tried per vectorized step of the 2-transfer search
+
+
+def projected_points(bootstrap, fixtures, start, horizon):
+    """Vector by element id of points projected over gameweeks start .. start + horizon - 1.
+
+    ep_next is scaled by the team's fixture ease over the window relative
+    to one average (FDR 3) fixture per gameweek, so blanks project nothing
+    and doubles project twice. Flagged players are scaled by their chance of playing.
+    """
+    players = bootstrap.players
+    teams = players['team'].to_numpy().astype(np.int64)
+    ease = fixtures.window('ease', start, horizon)
+    ease = np.where(teams < len(ease), ease[np.minimum(teams, len(ease) - 1)], 0)
+    chance = players['chance_of_playing_next_round'].to_numpy(dtype=float)
+    availability = np.where(np.isnan(chance), 1.0, chance / 100)
+    points = players['ep_next'].fillna(0).to_numpy(dtype=float) * ease / 3 * availability
+    vector = np.zeros(int(players['id'].max()) + 1 if len(players) else 1)
+    vector[players['id'].to_numpy()] = points
+    return vector
+
+
+class TransferPlanner:
+    """Best 1- and 2-transfer moves for one squad against the whole player pool.
+
+    The pool is split per position into arrays sorted by projected points
+    (best first). A single transfer takes the first affordable, club-legal
+    candidate in that order. A double transfer scans chunks of the first
+    position's candidates against every candidate of the second position
+    as one masked array operation, and stops once no remaining pair can
+    beat the best found. Transfers are like for like, so position quotas hold.
+    """
+
+    def __init__(self, bootstrap, points):
+        players = bootstrap.players
+        self.elements = players['id'].to_numpy()
+        self.points = points[self.elements]
+        self.cost = players['now_cost'].to_numpy().astype(np.int64)
+        self.team = players['team'].to_numpy().astype(np.int64)
+        self.position = players['element_type'].to_numpy().astype(np.int64)
+        self.row = {int(element): row for row, element in enumerate(self.elements)}
+        # Rows of each position sorted by projected points, best first
+        self.by_position = {
+            int(pos): rows[np.argsort(-self.points[rows], kind='stable')]
+            for pos in np.unique(self.position)
+            for rows in [np.flatnonzero(self.position == pos)]
+        }
+
+    def plan(self, squad, bank, free_transfers=1, top=5):
+        """DataFrame of the best moves: holding, the top single transfers and the top pairs.
+
+        squad is the 15 element ids, bank in tenths of a million like now_cost.
+        Outgoing players are valued at now_cost (selling prices are not public).
+        """
+        squad_rows = np.array([self.row[int(e)] for e in squad if int(e) in self.row])
+        owned = np.zeros(len(self.elements), dtype=bool)
+        owned[squad_rows] = True
+        club_counts = np.bincount(self.team[squad_rows], minlength=int(self.team.max()) + 1)
+
+        moves = [((), (), 0.0, bank)]
+        singles = [self._best_single(out, bank, owned, club_counts) for out in squad_rows]
+        moves += sorted((m for m in singles if m), key=lambda m: -m[2])[:top]
+        pairs = [self._best_pair(a, b, bank, owned, club_counts) for a, b in combinations(squad_rows, 2)]
+        moves += sorted((m for m in pairs if m), key=lambda m: -m[2])[:top]
+
+        plans = pd.DataFrame(moves, columns=['out', 'in', 'gain', 'bank'])
+        plans['transfers'] = plans['out'].map(len)
+        plans['hit'] = HIT_COST * np.maximum(plans['transfers'] - free_transfers, 0)
+        plans['net_gain'] = plans['gain'] - plans['hit']
+        plans['out'] = plans['out'].map(lambda rows: [int(self.elements[r]) for r in rows])
+        plans['in'] = plans['in'].map(lambda rows: [int(self.elements[r]) for r in rows])
+        return plans.sort_values('net_gain', ascending=False, ignore_index=True)
+
+    def _candidates(self, position, owned, club_counts):
+        """Sorted candidate rows for a position that are not owned and whose club has room"""
+        rows = self.by_position[int(position)]
+        return rows[~owned[rows] & (club_counts[self.team[rows]] < MAX_PER_CLUB)]
+
+    def _best_single(self, out, bank, owned, club_counts):
+        counts = club_counts.copy()
+        counts[self.team[out]] -= 1
+        budget = bank + self.cost[out]
+        rows = self._candidates(self.position[out], owned, counts)
+        affordable = rows[self.cost[rows] <= budget]
+        if len(affordable) == 0 or self.points[affordable[0]] <= self.points[out]:
+            return None
+        best = affordable[0]
+        return (out,), (best,), self.points[best] - self.points[out], budget - self.cost[best]
+
+    def _best_pair(self, out_a, out_b, bank, owned, club_counts):
+        counts = club_counts.copy()
+        np.subtract.at(counts, self.team[[out_a, out_b]], 1)
+        budget = bank + self.cost[out_a] + self.cost[out_b]
+        first = self._candidates(self.position[out_a], owned, counts)
+        second = self._candidates(self.position[out_b], owned, counts)
+        if len(first) == 0 or len(second) == 0:
+            return None
+        first = first[self.cost[first] <= budget - self.cost[second].min()]
+
+        best_points, best = self.points[out_a] + self.points[out_b], None
+        top_second = self.points[second[0]]
+        for start in range(0, len(first), CANDIDATE_CHUNK):
+            chunk = first[start:start + CANDIDATE_CHUNK]
+            # Sorted best first: nothing later in `first` can beat the best pair found
+            if self.points[chunk[0]] + top_second <= best_points:
+                break
+            legal = (
+                (self.cost[chunk][:, None] + self.cost[second][None, :] <= budget)
+                & (chunk[:, None] != second[None, :])
+                # A second signing from the same club needs two free slots
+                & ((self.team[chunk][:, None] != self.team[second][None, :]) | (counts[self.team[second]] + 2 <= MAX_PER_CLUB)[None, :])
+            )
+            totals = np.where(legal, self.points[chunk][:, None] + self.points[second][None, :], -np.inf)
+            i, j = np.unravel_index(np.argmax(totals), totals.shape)
+            if totals[i, j] > best_points:
+                best_points, best = totals[i, j], (chunk[i], second[j])
+        if best is None:
+            return None
+        gain = best_points - self.points[out_a] - self.points[out_b]
+        return (out_a, out_b), best, gain, budget - self.cost[best[0]] - self.cost[best[1]]